@@ -8,13 +8,13 @@ Alembic environment.  Wires our SQLAlchemy Base + sync URL so that
 from logging.config import fileConfig
 import sys, os
 
-from sqlalchemy import engine_from_config, pool
 from alembic import context
 
 # ── make sure the project root is on sys.path ────────────────────────
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app.config import settings                 # noqa: E402
+from app.db.engine import get_sync_engine      # noqa: E402
 from app.db.models import Base                  # noqa: E402  – pulls in all models
 
 # ── standard Alembic config ──────────────────────────────────────────
@@ -33,11 +33,9 @@ def run_migrations_offline():
 
 
 def run_migrations_online():
-    connectable = engine_from_config(
-        {"sqlalchemy.url": settings.postgres.sync_url},
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+    # Cached per process, so repeated run_migrations_online calls (e.g. a
+    # test harness) reuse one engine instead of building a pool each time
+    connectable = get_sync_engine()
     with connectable.connect() as conn:
         context.configure(connection=conn, target_metadata=target_metadata)
         with context.begin_transaction():
@@ -0,0 +1,33 @@
+"""
+alembic/versions/0002_draft_run_indexes.py
+──────────────────────────────────────────
+Composite indexes for the common draft lookups (drafts of a run by
+channel, a target's drafts by time) and a partial index over the
+in-flight outreach runs of each target.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision  = "0002_draft_run_indexes"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_draft_run_channel",    "draft_records", ["run_id", "channel"])
+    op.create_index("ix_draft_target_created", "draft_records", ["target_id", "created_at"])
+    op.create_index(
+        "ix_run_active",
+        "outreach_runs",
+        ["target_id"],
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_run_active",           table_name="outreach_runs")
+    op.drop_index("ix_draft_target_created", table_name="draft_records")
+    op.drop_index("ix_draft_run_channel",    table_name="draft_records")
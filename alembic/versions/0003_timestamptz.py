@@ -0,0 +1,44 @@
+"""
+alembic/versions/0003_timestamptz.py
+────────────────────────────────────
+Switch every timestamp column to TIMESTAMP WITH TIME ZONE.  Timestamps
+are now assigned server-side (func.now()); existing naive values were
+written as UTC, so they are converted AT TIME ZONE 'UTC'.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision  = "0003_timestamptz"
+down_revision = "0002_draft_run_indexes"
+branch_labels = None
+depends_on = None
+
+
+_COLUMNS = [
+    ("target_profiles", "created_at"),
+    ("target_profiles", "updated_at"),
+    ("persona_records", "created_at"),
+    ("outreach_runs",   "started_at"),
+    ("outreach_runs",   "completed_at"),
+    ("draft_records",   "created_at"),
+]
+
+
+def upgrade():
+    for table, column in _COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.DateTime(timezone=True),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
+
+
+def downgrade():
+    for table, column in _COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.DateTime(),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
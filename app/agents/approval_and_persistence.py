@@ -17,16 +17,14 @@ Two nodes that don't call the LLM:
 """
 
 from __future__ import annotations
-import asyncio
 import logging
 import uuid
-from datetime import datetime
 from typing import Any
 
 from langgraph.types import interrupt
 
 from app.graph.state   import OutreachState
-from app.utils.sanitizer import sanitize_for_storage, compute_target_hash
+from app.utils.sanitizer import sanitize_for_storage, compute_target_hash, target_hash_hex
 
 logger = logging.getLogger(__name__)
 
@@ -166,14 +164,16 @@ def persistence_node(state: OutreachState) -> OutreachState:
     """
     Writes sanitised data to Postgres AND ChromaDB.
 
-    Runs synchronously by wrapping the async Postgres calls in
-    asyncio.run() (safe because LangGraph node functions are sync by default).
+    Runs synchronously: the async Postgres calls are handed to the shared
+    DB loop via run_db() (LangGraph node functions are sync by default).
     """
     logger.info("=== PERSISTENCE START ===")
 
     # ── Sanitise ─────────────────────────────────────────────────────
     safe = sanitize_for_storage(state)
-    target_hash = state.get("target_hash", compute_target_hash("unknown"))
+    # State holds raw digest bytes; Postgres / ChromaDB keep the hex form
+    raw_hash = state.get("target_hash")
+    target_hash = target_hash_hex(raw_hash) if raw_hash else compute_target_hash("unknown")
 
     # ── 1. ChromaDB – upsert persona tone for future similarity ──────
     tone = state.get("tone", {})
@@ -199,7 +199,8 @@ def persistence_node(state: OutreachState) -> OutreachState:
 
     # ── 2. Postgres – write profile + persona + drafts + run ─────────
     try:
-        asyncio.run(_persist_to_postgres(target_hash, safe, state))
+        from app.db.engine import run_db
+        run_db(_persist_to_postgres(target_hash, safe, state))
         logger.info("Postgres persist OK.")
     except Exception as exc:
         logger.error("Postgres persist failed: %s", exc, exc_info=True)
@@ -224,7 +225,7 @@ async def _persist_to_postgres(
 
     async with get_session() as session:
         # ── TargetProfile  (upsert-style: check existence first) ──
-        from sqlalchemy import select
+        from sqlalchemy import func, insert, select
         existing = await session.execute(
             select(TargetProfile).where(TargetProfile.target_hash == target_hash)
         )
@@ -260,23 +261,28 @@ async def _persist_to_postgres(
             id=run_id,
             target_id=profile.id,
             status=full_state.get("status", "executed"),
-            completed_at=datetime.utcnow(),
+            completed_at=func.now(),
         )
         session.add(run)
 
-        # ── DraftRecords ──────────────────────────────────────────
-        for d in safe.get("drafts", []):
-            draft_record = DraftRecord(
-                target_id=profile.id,
-                run_id=run_id,
-                channel=d.get("channel", "unknown"),
-                subject=d.get("subject"),
-                body=d.get("body", ""),
-                score=d.get("score"),
-                approved=d.get("approved", False),
-                sent=d.get("sent", False),
-            )
-            session.add(draft_record)
+        logger.debug("Postgres: flushing %d objects", len(session.new))
+        await session.flush()       # run row must exist before its drafts
+
+        # ── DraftRecords  (one multi-row INSERT, not one per channel) ─
+        draft_rows = [
+            {
+                "target_id": profile.id,
+                "run_id":    run_id,
+                "channel":   d.get("channel", "unknown"),
+                "subject":   d.get("subject"),
+                "body":      d.get("body", ""),
+                "score":     d.get("score"),
+                "approved":  d.get("approved", False),
+                "sent":      d.get("sent", False),
+            }
+            for d in safe.get("drafts", [])
+        ]
+        if draft_rows:
+            await session.execute(insert(DraftRecord), draft_rows)
 
         # session auto-commits on exit (see engine.py)
-        logger.debug("Postgres: flushing %d objects", len(session.new))
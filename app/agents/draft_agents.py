@@ -27,6 +27,7 @@ from langchain_ollama import OllamaLLM
 
 from app.config import settings
 from app.graph.state import OutreachState, Draft, create_llm_action
+from app.utils.llm import invoke_with_backoff
 
 logger = logging.getLogger(__name__)
 
@@ -246,7 +247,7 @@ def _generate_draft(channel: str, state: OutreachState) -> tuple[Draft, dict]:
     llm = _get_llm()
     logger.info("[%s] Calling Ollama …", channel.upper())
     start_time = time.time()
-    raw_output = llm.invoke(prompt)
+    raw_output = invoke_with_backoff(llm, prompt)
     duration_ms = int((time.time() - start_time) * 1000)
     logger.debug("[%s] Raw output:\n%s", channel.upper(), raw_output)
 
@@ -297,37 +298,30 @@ def _generate_draft(channel: str, state: OutreachState) -> tuple[Draft, dict]:
 # Individual node functions  –  LangGraph calls each of these
 # ---------------------------------------------------------------------------
 # They all do the same thing but are separate so LangGraph can fan them out.
+# Each one only reads `state` and returns its own delta
+# ({"drafts": [draft], "llm_actions": [action]}), so several can run
+# concurrently against the same snapshot; the caller merges the deltas.
+
+def _draft_delta(channel: str, state: OutreachState) -> OutreachState:
+    draft, llm_action = _generate_draft(channel, state)
+    return {"drafts": [draft], "llm_actions": [llm_action]}
+
 
 def draft_email_node(state: OutreachState) -> OutreachState:
-    draft, llm_action = _generate_draft("email", state)
-    llm_actions = list(state.get("llm_actions", []))
-    llm_actions.append(llm_action)
-    return {**state, "drafts": state.get("drafts", []) + [draft], "llm_actions": llm_actions}
+    return _draft_delta("email", state)
 
 
 def draft_sms_node(state: OutreachState) -> OutreachState:
-    draft, llm_action = _generate_draft("sms", state)
-    llm_actions = list(state.get("llm_actions", []))
-    llm_actions.append(llm_action)
-    return {**state, "drafts": state.get("drafts", []) + [draft], "llm_actions": llm_actions}
+    return _draft_delta("sms", state)
 
 
 def draft_linkedin_node(state: OutreachState) -> OutreachState:
-    draft, llm_action = _generate_draft("linkedin", state)
-    llm_actions = list(state.get("llm_actions", []))
-    llm_actions.append(llm_action)
-    return {**state, "drafts": state.get("drafts", []) + [draft], "llm_actions": llm_actions}
+    return _draft_delta("linkedin", state)
 
 
 def draft_instagram_node(state: OutreachState) -> OutreachState:
-    draft, llm_action = _generate_draft("instagram", state)
-    llm_actions = list(state.get("llm_actions", []))
-    llm_actions.append(llm_action)
-    return {**state, "drafts": state.get("drafts", []) + [draft], "llm_actions": llm_actions}
+    return _draft_delta("instagram", state)
 
 
 def draft_whatsapp_node(state: OutreachState) -> OutreachState:
-    draft, llm_action = _generate_draft("whatsapp", state)
-    llm_actions = list(state.get("llm_actions", []))
-    llm_actions.append(llm_action)
-    return {**state, "drafts": state.get("drafts", []) + [draft], "llm_actions": llm_actions}
+    return _draft_delta("whatsapp", state)
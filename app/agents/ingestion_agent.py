@@ -25,7 +25,7 @@ import requests
 from bs4 import BeautifulSoup
 
 from app.graph.state import OutreachState, start_stage, complete_stage
-from app.utils.sanitizer import compute_target_hash
+from app.utils.sanitizer import compute_target_hash_bytes
 
 logger = logging.getLogger(__name__)
 
@@ -221,7 +221,7 @@ def ingestion_node(state: OutreachState) -> OutreachState:
     # ── 3. Compute opaque hash ────────────────────────────────────────
     # Use the first URL if available, else the whole raw input
     identifier = lines[0] if lines else raw_input
-    target_hash = compute_target_hash(identifier)
+    target_hash = compute_target_hash_bytes(identifier)
 
     # Complete stage tracking
     state = complete_stage(state, "ingestion")
@@ -241,6 +241,6 @@ def ingestion_node(state: OutreachState) -> OutreachState:
 
     logger.info(
         "Ingestion done | company=%s role=%s industry=%s links=%s hash=%s…",
-        company, role, industry, list(all_links.keys()), target_hash[:12],
+        company, role, industry, list(all_links.keys()), target_hash.hex()[:12],
     )
     return updated
@@ -28,6 +28,7 @@ from langchain_ollama import OllamaLLM
 from app.config import settings
 from app.db.vector_store import query_similar_personas
 from app.graph.state import OutreachState, create_llm_action, add_llm_action, start_stage, complete_stage
+from app.utils.llm import invoke_with_backoff
 
 logger = logging.getLogger(__name__)
 
@@ -164,7 +165,7 @@ def persona_node(state: OutreachState) -> OutreachState:
 
     logger.info("Calling Ollama for persona analysis …")
     start_time = time.time()
-    raw_output: str = llm.invoke(prompt)
+    raw_output: str = invoke_with_backoff(llm, prompt)
     duration_ms = int((time.time() - start_time) * 1000)
     logger.debug("Raw LLM output:\n%s", raw_output)
 
@@ -22,6 +22,7 @@ from langchain_ollama import OllamaLLM
 
 from app.config import settings
 from app.graph.state import OutreachState, create_llm_action, add_llm_action, start_stage, complete_stage
+from app.utils.llm import invoke_with_backoff
 
 logger = logging.getLogger(__name__)
 
@@ -100,7 +101,7 @@ def scoring_node(state: OutreachState) -> OutreachState:
     llm = _get_llm()
     logger.info("Calling Ollama for scoring …")
     start_time = time.time()
-    raw_output = llm.invoke(prompt)
+    raw_output = invoke_with_backoff(llm, prompt)
     duration_ms = int((time.time() - start_time) * 1000)
     logger.debug("Scoring raw output:\n%s", raw_output)
 
@@ -10,20 +10,22 @@ import logging
 from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks
+import aiofiles
+from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from app.api.schemas import (
     CampaignStartRequest, CampaignResponse,
-    DraftResponse, DraftActionRequest, StageUpdate,
-    LLMActionResponse, StageInfoResponse, PersonaResponse,
     SessionSummary, SessionDetail, SessionCreateRequest
 )
-from app.api.state_manager import state_manager
-from app.api.workflow_runner import run_campaign_workflow
+from app.api.state_manager import state_manager, encode_sse
+from app.api.workflow_runner import (
+    submit_campaign_workflow, workflow_backlog_full,
+    start_workflow_workers, start_workflow_pool, shutdown_workflow_pool,
+)
+from app.graph.workflow import get_compiled_graph
 from app.utils.llm import check_ollama_health, get_model_info, list_recommended_models
 
 logging.basicConfig(
@@ -35,7 +37,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Outreach Engine API",
     version="1.0.0",
-    description="LLM-powered hyper-personalized cold outreach automation"
+    description="LLM-powered hyper-personalized cold outreach automation",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS for frontend
@@ -50,14 +53,48 @@ app.add_middleware(
 # Upload directory for files
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
+UPLOAD_CHUNK_SIZE = 1 << 20     # 1 MiB
+
+# SSE comment sent on idle streams so proxies don't drop the connection
+SSE_KEEPALIVE_SECONDS = 15
+SSE_KEEPALIVE_FRAME = b": keepalive\n\n"
+
+
+@app.on_event("startup")
+async def _on_startup():
+    """Warm the compiled graph and start background tasks."""
+    get_compiled_graph()            # compile once, before the first campaign
+    start_workflow_pool()
+    start_workflow_workers()
+    state_manager.start_gc()
+
+
+@app.on_event("shutdown")
+async def _on_shutdown():
+    shutdown_workflow_pool()
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _build_campaign_response(campaign: dict, campaign_id: str) -> CampaignResponse:
-    """Build a CampaignResponse from campaign data."""
+def _ensure_workflow_capacity():
+    """Reject new campaigns up front while the workflow backlog is full."""
+    if workflow_backlog_full():
+        raise HTTPException(
+            status_code=503,
+            detail="Too many campaigns queued – try again shortly"
+        )
+
+
+def _build_campaign_payload(campaign: dict, campaign_id: str) -> dict[str, Any]:
+    """
+    Build the CampaignResponse-shaped dict for a campaign.
+
+    Campaign state is produced by our own nodes, so the hot read paths
+    serialise this dict directly with orjson instead of round-tripping
+    through Pydantic models first.
+    """
     state = campaign.get("state", {})
     drafts_data = state.get("drafts", [])
     llm_actions_data = state.get("llm_actions", [])
@@ -66,80 +103,83 @@ def _build_campaign_response(campaign: dict, campaign_id: str) -> CampaignRespon
     
     # Build drafts response
     drafts = [
-        DraftResponse(
-            id=d.get("id"),
-            channel=d["channel"],
-            subject=d.get("subject"),
-            body=d["body"],
-            score=d.get("score"),
-            score_rationale=d.get("score_rationale"),
-            approved=d.get("approved", False),
-            sent=d.get("sent", False),
-            version=d.get("version", 1),
-            regenerate_count=d.get("regenerate_count", 0),
-            created_at=d.get("created_at")
-        )
+        {
+            "id": d.get("id"),
+            "channel": d["channel"],
+            "subject": d.get("subject"),
+            "body": d["body"],
+            "score": d.get("score"),
+            "score_rationale": d.get("score_rationale"),
+            "approved": d.get("approved", False),
+            "sent": d.get("sent", False),
+            "version": d.get("version", 1),
+            "regenerate_count": d.get("regenerate_count", 0),
+            "created_at": d.get("created_at"),
+        }
         for d in drafts_data
     ]
     
     # Build LLM actions response
     llm_actions = [
-        LLMActionResponse(
-            id=a.get("id", ""),
-            timestamp=a.get("timestamp", ""),
-            stage=a.get("stage", ""),
-            agent=a.get("agent", ""),
-            action=a.get("action", ""),
-            model=a.get("model", ""),
-            prompt_preview=a.get("prompt_preview", ""),
-            response_preview=a.get("response_preview", ""),
-            tokens_used=a.get("tokens_used"),
-            duration_ms=a.get("duration_ms", 0),
-            status=a.get("status", ""),
-            error_message=a.get("error_message")
-        )
+        {
+            "id": a.get("id", ""),
+            "timestamp": a.get("timestamp", ""),
+            "stage": a.get("stage", ""),
+            "agent": a.get("agent", ""),
+            "action": a.get("action", ""),
+            "model": a.get("model", ""),
+            "prompt_preview": a.get("prompt_preview", ""),
+            "response_preview": a.get("response_preview", ""),
+            "tokens_used": a.get("tokens_used"),
+            "duration_ms": a.get("duration_ms", 0),
+            "status": a.get("status", ""),
+            "error_message": a.get("error_message"),
+        }
         for a in llm_actions_data
     ]
     
     # Build stages response
     stages = [
-        StageInfoResponse(
-            name=s.get("name", ""),
-            started_at=s.get("started_at"),
-            completed_at=s.get("completed_at"),
-            duration_ms=s.get("duration_ms"),
-            status=s.get("status", "pending")
-        )
+        {
+            "name": s.get("name", ""),
+            "started_at": s.get("started_at"),
+            "completed_at": s.get("completed_at"),
+            "duration_ms": s.get("duration_ms"),
+            "status": s.get("status", "pending"),
+        }
         for s in stages_data
     ]
     
     # Build persona response from tone data
     persona = None
     if tone:
-        persona = PersonaResponse(
-            name=tone.get("name"),
-            company=state.get("company"),
-            role=state.get("role"),
-            industry=state.get("industry"),
-            seniority=tone.get("seniority"),
-            communication_style=tone.get("communication_style"),
-            key_interests=tone.get("interests", []),
-            recommended_approach=tone.get("recommended_approach"),
-        )
+        persona = {
+            "name": tone.get("name"),
+            "company": state.get("company"),
+            "role": state.get("role"),
+            "industry": state.get("industry"),
+            "seniority": tone.get("seniority"),
+            "communication_style": tone.get("communication_style"),
+            "key_interests": tone.get("interests", []),
+            "pain_points": [],
+            "decision_factors": [],
+            "recommended_approach": tone.get("recommended_approach"),
+            "confidence_score": None,
+        }
     
-    return CampaignResponse(
-        campaign_id=campaign_id,
-        session_id=campaign.get("session_id"),
-        status=campaign["status"],
-        current_stage=campaign["current_stage"],
-        target_company=state.get("company"),
-        target_role=state.get("role"),
-        drafts=drafts,
-        llm_actions=llm_actions,
-        stages=stages,
-        persona=persona,
-        error=campaign.get("error")
-    )
+    return {
+        "campaign_id": campaign_id,
+        "session_id": campaign.get("session_id"),
+        "status": campaign["status"],
+        "current_stage": campaign["current_stage"],
+        "target_company": state.get("company"),
+        "target_role": state.get("role"),
+        "drafts": drafts,
+        "llm_actions": llm_actions,
+        "stages": stages,
+        "persona": persona,
+        "error": campaign.get("error"),
+    }
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -192,10 +232,7 @@ async def get_recommended_models():
 
 
 @app.post("/api/v1/campaigns", response_model=CampaignResponse)
-async def create_campaign(
-    request: CampaignStartRequest,
-    background_tasks: BackgroundTasks
-):
+async def create_campaign(request: CampaignStartRequest):
     """
     Start a new outreach campaign.
     
@@ -205,6 +242,8 @@ async def create_campaign(
     - File path (PDF/DOC with mock data)
     """
     try:
+        _ensure_workflow_capacity()
+        
         # Create campaign (with optional session_id)
         campaign_id = state_manager.create_campaign(
             input_data={
@@ -214,26 +253,21 @@ async def create_campaign(
             session_id=request.session_id
         )
         
-        # Start workflow in background
-        background_tasks.add_task(
-            run_campaign_workflow,
-            campaign_id,
-            request.content
-        )
+        # Queue workflow for a background worker
+        submit_campaign_workflow(campaign_id, request.content)
         
         campaign = state_manager.get_campaign(campaign_id)
-        return _build_campaign_response(campaign, campaign_id)
+        return _build_campaign_payload(campaign, campaign_id)
         
+    except HTTPException:
+        raise
     except Exception as exc:
         logger.error(f"Failed to create campaign: {exc}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(exc))
 
 
 @app.post("/api/v1/campaigns/upload")
-async def upload_file(
-    file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = None
-):
+async def upload_file(file: UploadFile = File(...)):
     """
     Upload a PDF or DOC file and start a campaign.
     """
@@ -244,12 +278,14 @@ async def upload_file(
                 status_code=400,
                 detail="Only PDF and DOC/DOCX files are supported"
             )
+        _ensure_workflow_capacity()
         
-        # Save file
+        # Save file (streamed in fixed-size chunks – constant memory; disk
+        # writes run in aiofiles' thread pool so the loop is never blocked)
         file_path = UPLOAD_DIR / file.filename
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        async with aiofiles.open(file_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await f.write(chunk)
         
         logger.info(f"Uploaded file: {file_path}")
         
@@ -261,15 +297,21 @@ async def upload_file(
             }
         )
         
-        # Start workflow in background
-        background_tasks.add_task(
-            run_campaign_workflow,
-            campaign_id,
-            str(file_path)
-        )
+        # Queue workflow for a background worker.  The backlog may have
+        # filled while the upload streamed in – undo rather than orphan it
+        # (uploads always get a fresh session, so drop that with it).
+        try:
+            submit_campaign_workflow(campaign_id, str(file_path))
+        except asyncio.QueueFull:
+            state_manager.delete_session(state_manager.get_campaign(campaign_id)["session_id"])
+            file_path.unlink(missing_ok=True)
+            raise HTTPException(
+                status_code=503,
+                detail="Too many campaigns queued – try again shortly"
+            )
         
         campaign = state_manager.get_campaign(campaign_id)
-        return _build_campaign_response(campaign, campaign_id)
+        return _build_campaign_payload(campaign, campaign_id)
         
     except HTTPException:
         raise
@@ -286,7 +328,7 @@ async def get_campaign(campaign_id: str):
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
-    return _build_campaign_response(campaign, campaign_id)
+    return ORJSONResponse(_build_campaign_payload(campaign, campaign_id))
 
 
 @app.get("/api/v1/campaigns/{campaign_id}/stream")
@@ -302,14 +344,30 @@ async def stream_campaign_updates(campaign_id: str):
         # Subscribe to campaign events
         queue = state_manager.subscribe(campaign_id)
         
+        # Race the next event against a keepalive timer.  asyncio.wait()
+        # just reports which finished – unlike wait_for(), an idle tick
+        # doesn't raise (and unwind) a TimeoutError on every interval.
+        get_task = asyncio.create_task(queue.get())
+        tick = asyncio.create_task(asyncio.sleep(SSE_KEEPALIVE_SECONDS))
+        
         try:
             # Send current state first
-            yield f"data: {campaign}\n\n"
+            yield encode_sse(campaign)
             
-            # Stream updates
+            # Stream updates (frames arrive pre-serialised from the broadcaster)
             while True:
-                event = await queue.get()
-                yield f"data: {event}\n\n"
+                done, _ = await asyncio.wait(
+                    {get_task, tick}, return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                if tick in done:
+                    yield SSE_KEEPALIVE_FRAME
+                    tick = asyncio.create_task(asyncio.sleep(SSE_KEEPALIVE_SECONDS))
+                
+                if get_task not in done:
+                    continue
+                event, frame = get_task.result()
+                yield frame
                 
                 # End stream if campaign completed or failed
                 if event.get("type") == "stage_update":
@@ -317,7 +375,11 @@ async def stream_campaign_updates(campaign_id: str):
                         current_campaign = state_manager.get_campaign(campaign_id)
                         if current_campaign and current_campaign.get("status") in ("completed", "failed"):
                             break
+                
+                get_task = asyncio.create_task(queue.get())
         finally:
+            get_task.cancel()
+            tick.cancel()
             state_manager.unsubscribe(campaign_id, queue)
     
     return StreamingResponse(
@@ -409,7 +471,7 @@ async def get_session(session_id: str):
         raise HTTPException(status_code=404, detail="Session not found")
     
     campaigns = [
-        _build_campaign_response(c, c["id"]) 
+        _build_campaign_payload(c, c["id"])
         for c in session.get("campaigns", [])
     ]
     
@@ -448,7 +510,8 @@ async def update_session_name(session_id: str, name: str):
 # STATIC FILES (for serving frontend in production)
 # ═══════════════════════════════════════════════════════════════════════════
 
-# Uncomment when frontend is built
+# Uncomment when frontend is built (import kept out of the cold-start path)
+# from fastapi.staticfiles import StaticFiles
 # app.mount("/", StaticFiles(directory="frontend/dist", html=True), name="static")
 
 
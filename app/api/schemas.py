@@ -5,7 +5,6 @@ Pydantic request/response models for the API.
 """
 
 from __future__ import annotations
-from datetime import datetime
 from typing import Any
 from pydantic import BaseModel, Field
 
@@ -86,7 +85,7 @@ class StageUpdate(BaseModel):
     stage: str
     status: str  # 'pending', 'running', 'completed', 'failed'
     message: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: float | None = None  # epoch seconds, stamped by the server
 
 
 class CampaignResponse(BaseModel):
@@ -3,31 +3,72 @@ app/api/state_manager.py
 ─────────────────────────
 In-memory state management for single-user prototype.
 Stores active campaigns, sessions, and provides async event streaming.
+
+Memory is bounded: idle campaigns are evicted (LRU cap + TTL) and a
+session whose campaigns have all been evicted is unloaded to a small
+summary.  Its JSON file stays on disk and is re-read on next access.
 """
 
 from __future__ import annotations
 import asyncio
 import uuid
 import json
-from datetime import datetime
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 import logging
 
+import orjson
+
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
 # Directory for session persistence
 SESSIONS_DIR = Path("sessions")
 SESSIONS_DIR.mkdir(exist_ok=True)
 
+# Campaign statuses after which no more events will be published
+TERMINAL_STATUSES = ("completed", "failed")
+
+def _json_default(obj: Any) -> Any:
+    """Fallback for values JSON can't express (raw digests as hex, rest as str)."""
+    if isinstance(obj, bytes):
+        return obj.hex()
+    return str(obj)
+
+def encode_sse(data: Any) -> bytes:
+    """Serialise one payload as a complete SSE `data:` frame."""
+    return b"data: " + orjson.dumps(data, default=_json_default) + b"\n\n"
+
+
+# How often the background sweeper looks for expired campaigns (seconds)
+GC_INTERVAL = 60
+
 
 class StateManager:
     """Manages campaign state, sessions, and event broadcasting."""
     
     def __init__(self):
-        self.campaigns: dict[str, dict[str, Any]] = {}
+        # LRU order: least-recently-touched campaign first
+        self.campaigns: OrderedDict[str, dict[str, Any]] = OrderedDict()
         self.sessions: dict[str, dict[str, Any]] = {}
-        self.event_queues: dict[str, list[asyncio.Queue]] = {}
+        # Sessions evicted from memory – summary only, full data on disk
+        self._unloaded_sessions: dict[str, dict[str, Any]] = {}
+        # campaign_id → session_id for campaigns of unloaded sessions, so a
+        # lookup can bring the session back from disk
+        self._campaign_sessions: dict[str, str] = {}
+        self._gc_task: asyncio.Task | None = None
+        self.event_queues: dict[str, set[asyncio.Queue]] = {}
+        # Per-campaign ingress queue + the long-lived task that drains it.
+        # Holding the task here keeps it from being garbage-collected.
+        self._ingress: dict[str, asyncio.Queue] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        # The API's event loop, captured on first use so that updates
+        # arriving from worker threads can be handed back to it.
+        self._loop: asyncio.AbstractEventLoop | None = None
         
         # Load existing sessions from disk
         self._load_sessions()
@@ -48,6 +89,23 @@ class StateManager:
         except Exception as e:
             logger.error(f"Failed to load sessions: {e}")
     
+    def _reload_session(self, session_id: str) -> dict[str, Any] | None:
+        """Bring an unloaded session (and its campaigns) back from disk."""
+        try:
+            with open(SESSIONS_DIR / f"{session_id}.json", "r") as f:
+                session_data = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to reload session {session_id}: {e}")
+            return None
+        
+        self._unloaded_sessions.pop(session_id, None)
+        self.sessions[session_id] = session_data
+        for campaign in session_data.get("campaigns", []):
+            self.campaigns[campaign["id"]] = campaign
+            self._campaign_sessions.pop(campaign["id"], None)
+        logger.debug(f"Reloaded session {session_id}")
+        return session_data
+    
     def _save_session(self, session_id: str):
         """Save a session to disk."""
         try:
@@ -55,7 +113,7 @@ class StateManager:
             if session:
                 session_file = SESSIONS_DIR / f"{session_id}.json"
                 with open(session_file, "w") as f:
-                    json.dump(session, f, indent=2, default=str)
+                    json.dump(session, f, indent=2, default=_json_default)
                 logger.debug(f"Saved session {session_id}")
         except Exception as e:
             logger.error(f"Failed to save session {session_id}: {e}")
@@ -67,7 +125,7 @@ class StateManager:
         
         self.sessions[session_id] = {
             "session_id": session_id,
-            "name": name or f"Session {len(self.sessions) + 1}",
+            "name": name or f"Session {len(self.sessions) + len(self._unloaded_sessions) + 1}",
             "created_at": now,
             "updated_at": now,
             "campaigns": []
@@ -78,25 +136,32 @@ class StateManager:
         return session_id
     
     def get_session(self, session_id: str) -> dict[str, Any] | None:
-        """Get session by ID."""
-        return self.sessions.get(session_id)
+        """Get session by ID (reloading it from disk if it was evicted)."""
+        session = self.sessions.get(session_id)
+        if session is None and session_id in self._unloaded_sessions:
+            session = self._reload_session(session_id)
+        return session
+    
+    @staticmethod
+    def _summarize_session(session: dict[str, Any]) -> dict[str, Any]:
+        """Sidebar summary for one session."""
+        campaigns = session.get("campaigns", [])
+        last_campaign = campaigns[-1] if campaigns else None
+        
+        return {
+            "session_id": session["session_id"],
+            "name": session["name"],
+            "created_at": session["created_at"],
+            "updated_at": session["updated_at"],
+            "campaign_count": len(campaigns),
+            "last_company": last_campaign.get("state", {}).get("company") if last_campaign else None,
+            "last_role": last_campaign.get("state", {}).get("role") if last_campaign else None,
+        }
     
     def list_sessions(self) -> list[dict[str, Any]]:
         """List all sessions with summaries."""
-        summaries = []
-        for session in self.sessions.values():
-            campaigns = session.get("campaigns", [])
-            last_campaign = campaigns[-1] if campaigns else None
-            
-            summaries.append({
-                "session_id": session["session_id"],
-                "name": session["name"],
-                "created_at": session["created_at"],
-                "updated_at": session["updated_at"],
-                "campaign_count": len(campaigns),
-                "last_company": last_campaign.get("state", {}).get("company") if last_campaign else None,
-                "last_role": last_campaign.get("state", {}).get("role") if last_campaign else None,
-            })
+        summaries = [self._summarize_session(s) for s in self.sessions.values()]
+        summaries.extend(self._unloaded_sessions.values())
         
         # Sort by updated_at descending
         summaries.sort(key=lambda x: x["updated_at"], reverse=True)
@@ -104,11 +169,13 @@ class StateManager:
     
     def delete_session(self, session_id: str) -> bool:
         """Delete a session and its campaigns."""
-        if session_id in self.sessions:
+        if self.get_session(session_id) is not None:
             # Remove campaigns
             for campaign in self.sessions[session_id].get("campaigns", []):
                 if campaign["id"] in self.campaigns:
                     del self.campaigns[campaign["id"]]
+                self._stop_broadcaster(campaign["id"])
+                self.event_queues.pop(campaign["id"], None)
             
             del self.sessions[session_id]
             
@@ -129,7 +196,7 @@ class StateManager:
         # Create or use existing session
         if not session_id:
             session_id = self.create_session()
-        elif session_id not in self.sessions:
+        elif self.get_session(session_id) is None:
             session_id = self.create_session()
         
         campaign = {
@@ -157,24 +224,37 @@ class StateManager:
         }
         
         self.campaigns[campaign_id] = campaign
-        self.event_queues[campaign_id] = []
+        self.event_queues[campaign_id] = set()
+        self._start_broadcaster(campaign_id)
         
         # Add to session
         self.sessions[session_id]["campaigns"].append(campaign)
         self.sessions[session_id]["updated_at"] = now.isoformat() + "Z"
         self._save_session(session_id)
+        self._evict_if_needed(keep=session_id)
         
         logger.info(f"Created campaign {campaign_id} in session {session_id}")
         return campaign_id
     
     def get_campaign(self, campaign_id: str) -> dict[str, Any] | None:
-        """Get campaign by ID."""
-        return self.campaigns.get(campaign_id)
+        """Get campaign by ID (reloading its session from disk if it was evicted)."""
+        campaign = self.campaigns.get(campaign_id)
+        if campaign is None:
+            session_id = self._campaign_sessions.get(campaign_id)
+            if session_id is None or self._reload_session(session_id) is None:
+                return None
+            campaign = self.campaigns.get(campaign_id)
+            if campaign is None:
+                return None
+            self._evict_if_needed(keep=session_id)
+        self.campaigns.move_to_end(campaign_id)
+        return campaign
     
     def update_stage(self, campaign_id: str, stage: str, status: str, message: str = ""):
         """Update a specific stage status."""
         if campaign_id in self.campaigns:
             now = datetime.utcnow()
+            self.campaigns.move_to_end(campaign_id)
             self.campaigns[campaign_id]["stages"][stage] = {
                 "status": status,
                 "message": message,
@@ -195,14 +275,15 @@ class StateManager:
                 "stage": stage,
                 "status": status,
                 "message": message,
-                "timestamp": now.isoformat() + "Z"
+                "timestamp": time.time()        # epoch seconds – client formats
             }
-            asyncio.create_task(self._broadcast_event(campaign_id, event))
+            self._publish(campaign_id, event)
     
     def update_state(self, campaign_id: str, state: dict[str, Any]):
         """Update the full LangGraph state."""
         if campaign_id in self.campaigns:
             now = datetime.utcnow()
+            self.campaigns.move_to_end(campaign_id)
             self.campaigns[campaign_id]["state"] = state
             self.campaigns[campaign_id]["status"] = state.get("status", "running")
             self.campaigns[campaign_id]["updated_at"] = now.isoformat() + "Z"
@@ -224,34 +305,225 @@ class StateManager:
                 event = {
                     "type": "llm_actions_update",
                     "actions": llm_actions,
-                    "timestamp": now.isoformat() + "Z"
+                    "timestamp": time.time()
                 }
-                asyncio.create_task(self._broadcast_event(campaign_id, event))
+                self._publish(campaign_id, event)
+    
+    def mark_finished(self, campaign_id: str, status: str, error: str | None = None):
+        """Record a terminal status ('completed' / 'failed') and persist it."""
+        campaign = self.campaigns.get(campaign_id)
+        if not campaign:
+            return
+        
+        now = datetime.utcnow().isoformat() + "Z"
+        campaign["status"] = status
+        campaign["completed_at"] = now
+        campaign["updated_at"] = now
+        if error:
+            campaign["error"] = error
+        
+        session_id = campaign.get("session_id")
+        if session_id in self.sessions:
+            self._save_session(session_id)
+        # Finishing may make its session evictable
+        self._evict_if_needed()
+    
+    # ── eviction ──────────────────────────────────────────────────────
+    #
+    # Eviction works a session at a time: a session's campaign dicts are
+    # shared with session["campaigns"], so memory is only freed once the
+    # whole session is unloaded.  Only sessions whose campaigns have all
+    # reached a terminal status are eligible – queued, running and paused
+    # campaigns always stay resident – and only once nobody is still
+    # listening and no event is still waiting to be delivered.
+    
+    def _session_evictable(self, session: dict[str, Any]) -> bool:
+        for campaign in session.get("campaigns", []):
+            campaign_id = campaign["id"]
+            if campaign.get("status") not in TERMINAL_STATUSES:
+                return False
+            if self.event_queues.get(campaign_id):
+                return False        # live SSE subscriber
+            ingress = self._ingress.get(campaign_id)
+            if ingress is not None and not ingress.empty():
+                return False        # events not yet fanned out
+        return True
+    
+    def _unload_session(self, session_id: str):
+        """Drop a session and its campaigns from memory (the file stays on disk)."""
+        session = self.sessions.get(session_id)
+        if session is None:
+            return
+        self._save_session(session_id)
+        for campaign in session.get("campaigns", []):
+            campaign_id = campaign["id"]
+            self.campaigns.pop(campaign_id, None)
+            self._stop_broadcaster(campaign_id)
+            self.event_queues.pop(campaign_id, None)
+            self._campaign_sessions[campaign_id] = session_id
+        self._unloaded_sessions[session_id] = self._summarize_session(session)
+        del self.sessions[session_id]
+        logger.debug(f"Unloaded session {session_id}")
+    
+    def _evict_if_needed(self, keep: str | None = None):
+        """Enforce the LRU cap by unloading the least-recently-used finished sessions."""
+        if len(self.campaigns) <= settings.max_campaigns:
+            return
+        for campaign_id in list(self.campaigns):
+            if len(self.campaigns) <= settings.max_campaigns:
+                break
+            campaign = self.campaigns.get(campaign_id)
+            if campaign is None:
+                continue            # went with an earlier session
+            session_id = campaign.get("session_id")
+            session = self.sessions.get(session_id)
+            if session_id != keep and session and self._session_evictable(session):
+                self._unload_session(session_id)
+    
+    def _evict_expired(self):
+        """Unload finished sessions untouched for longer than the TTL."""
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.campaign_ttl_seconds)
+        expired = []
+        for session_id, session in self.sessions.items():
+            if not self._session_evictable(session):
+                continue
+            try:
+                updated = max(
+                    datetime.fromisoformat(c["updated_at"].rstrip("Z"))
+                    for c in session.get("campaigns", [])
+                )
+            except (KeyError, ValueError, AttributeError):
+                updated = datetime.min
+            if updated < cutoff:
+                expired.append(session_id)
+        
+        for session_id in expired:
+            self._unload_session(session_id)
+        if expired:
+            logger.info(f"Unloaded {len(expired)} expired sessions")
+    
+    async def _gc_loop(self):
+        """Periodically sweep expired campaigns."""
+        while True:
+            await asyncio.sleep(GC_INTERVAL)
+            try:
+                self._evict_expired()
+            except Exception as e:
+                logger.error(f"Campaign GC failed: {e}")
+    
+    def start_gc(self):
+        """Start the background sweeper (call from the app's startup hook)."""
+        if self._gc_task is None:
+            self._gc_task = asyncio.create_task(self._gc_loop())
+    
+    # ── event broadcasting ────────────────────────────────────────────
+    
+    def _start_broadcaster(self, campaign_id: str) -> asyncio.Queue | None:
+        """Start the campaign's broadcaster task (needs a running loop)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None             # no loop (e.g. CLI) – nobody to stream to
+        if self._loop is None:
+            self._loop = loop
+        
+        # Unbounded: the broadcaster never blocks, so the ingress only ever
+        # holds what was published since its last wake-up.  A cap here would
+        # drop the newest event (possibly the terminal one) for everybody;
+        # per-subscriber queues apply drop-oldest instead.
+        ingress = asyncio.Queue()
+        self._ingress[campaign_id] = ingress
+        self._tasks[campaign_id] = asyncio.create_task(self._broadcaster_loop(campaign_id))
+        return ingress
     
-    async def _broadcast_event(self, campaign_id: str, event: dict[str, Any]):
-        """Broadcast event to all subscribers."""
+    def _stop_broadcaster(self, campaign_id: str):
+        """Cancel the campaign's broadcaster task, if any."""
+        self._ingress.pop(campaign_id, None)
+        task = self._tasks.pop(campaign_id, None)
+        if task:
+            task.cancel()
+    
+    def _publish(self, campaign_id: str, event: dict[str, Any]):
+        """
+        Hand an event to the campaign's broadcaster without blocking.
+
+        Safe to call from any thread: off the API loop (e.g. from a sync
+        LangGraph node running in an executor) the enqueue is scheduled
+        onto the loop with call_soon_threadsafe.  On-loop calls go through
+        the same callback queue, so events keep their publish order.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self._loop is None:
+            self._loop = running
+        
+        if running is not None and running is self._loop:
+            self._loop.call_soon(self._enqueue, campaign_id, event)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._enqueue, campaign_id, event)
+    
+    def _enqueue(self, campaign_id: str, event: dict[str, Any]):
+        """Put an event on the ingress queue (must run on the API loop)."""
+        if campaign_id not in self.campaigns:
+            return                  # deleted or unloaded – nobody to deliver to
+        ingress = self._ingress.get(campaign_id)
+        if ingress is None:
+            ingress = self._start_broadcaster(campaign_id)
+            if ingress is None:
+                return
+        ingress.put_nowait(event)
+    
+    async def _broadcaster_loop(self, campaign_id: str):
+        """Drain the ingress queue in order and fan out to subscribers."""
+        ingress = self._ingress[campaign_id]
+        while True:
+            event = await ingress.get()
+            self._broadcast_event(campaign_id, event)
+    
+    def _broadcast_event(self, campaign_id: str, event: dict[str, Any]):
+        """
+        Broadcast event to all subscribers.
+
+        Each subscriber receives an `(event, frame)` tuple – the frame is
+        serialised once here and shared, not re-encoded per client.
+
+        Never blocks: a subscriber whose queue is full has its oldest
+        event dropped, so one slow SSE client can't stall the others.
+        """
         if campaign_id in self.event_queues:
-            for queue in self.event_queues[campaign_id]:
+            item = (event, encode_sse(event))
+            for queue in list(self.event_queues[campaign_id]):
                 try:
-                    await queue.put(event)
+                    queue.put_nowait(item)
+                except asyncio.QueueFull:
+                    # Drop-oldest policy
+                    queue.get_nowait()
+                    queue.put_nowait(item)
+                    logger.warning(f"Slow subscriber on campaign {campaign_id} – dropped oldest event")
                 except Exception as e:
                     logger.error(f"Failed to broadcast event: {e}")
     
     def subscribe(self, campaign_id: str) -> asyncio.Queue:
         """Subscribe to campaign events."""
-        queue = asyncio.Queue()
-        if campaign_id not in self.event_queues:
-            self.event_queues[campaign_id] = []
-        self.event_queues[campaign_id].append(queue)
+        queue = asyncio.Queue(maxsize=settings.sse_max_queue_size)
+        self.event_queues.setdefault(campaign_id, set()).add(queue)
         return queue
     
     def unsubscribe(self, campaign_id: str, queue: asyncio.Queue):
         """Unsubscribe from campaign events."""
-        if campaign_id in self.event_queues:
-            try:
-                self.event_queues[campaign_id].remove(queue)
-            except ValueError:
-                pass
+        queues = self.event_queues.get(campaign_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        
+        # Last listener gone on a finished campaign – drop the entry entirely
+        campaign = self.campaigns.get(campaign_id)
+        if not queues and (campaign is None or campaign.get("status") in TERMINAL_STATUSES):
+            del self.event_queues[campaign_id]
+            # ...which may be what was keeping its session resident
+            self._evict_if_needed()
 
 
 # Global singleton for single-user prototype
@@ -6,84 +6,214 @@ Async wrapper for running LangGraph workflows with real-time updates.
 
 from __future__ import annotations
 import asyncio
+import functools
 import logging
-from typing import Any
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing
+from typing import Any, AsyncIterator
 
-from app.graph.workflow import build_graph
+from app.config import settings
+from app.graph.workflow import get_compiled_graph
+from app.graph.worker import stream_graph_in_worker
 from app.api.state_manager import state_manager
 
 logger = logging.getLogger(__name__)
 
 
+# ---------------------------------------------------------------------------
+# Admission control  –  caps in-flight workflows so a burst of campaigns
+# can't exhaust memory, LLM connections or the DB pool.  The backlog already
+# runs exactly MAX_CONCURRENT_WORKFLOWS workers; the semaphore also bounds
+# anyone calling run_campaign_workflow directly.
+# ---------------------------------------------------------------------------
+WORKFLOW_SEM = asyncio.Semaphore(settings.max_concurrent_workflows)
+
+
+# ---------------------------------------------------------------------------
+# Optional worker-process pool  (WORKFLOW_PROCESS_WORKERS > 0)
+# ─────────────────────────────
+# Graph nodes do blocking / CPU-heavy work (HTML + PDF parsing, sync LLM
+# clients).  Running the graph in long-lived worker processes keeps that
+# off the API process entirely, so SSE fan-out stays responsive.  Node
+# events are relayed back through a Manager queue; the API side still
+# owns every state_manager update.
+# ---------------------------------------------------------------------------
+_workflow_pool: ProcessPoolExecutor | None = None
+_manager: Any = None
+
+
+def start_workflow_pool() -> None:
+    """Start the worker pool if enabled (call from the app's startup hook)."""
+    global _workflow_pool, _manager
+    workers = settings.workflow_process_workers
+    if workers <= 0 or _workflow_pool is not None:
+        return
+    # spawn, not fork – the API process already has a loop and threads
+    ctx = multiprocessing.get_context("spawn")
+    _manager = ctx.Manager()
+    _workflow_pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+    logger.info(f"Workflow process pool started ({workers} workers)")
+
+
+def shutdown_workflow_pool() -> None:
+    """Stop the worker pool (call from the app's shutdown hook)."""
+    global _workflow_pool, _manager
+    if _workflow_pool is not None:
+        _workflow_pool.shutdown(wait=False, cancel_futures=True)
+        _manager.shutdown()
+        _workflow_pool = _manager = None
+
+
+async def _graph_events(initial_state: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
+    """Yield graph events – from a worker process if the pool is running."""
+    if _workflow_pool is None:
+        async for event in get_compiled_graph().astream(initial_state):
+            yield event
+        return
+
+    loop = asyncio.get_running_loop()
+    events = _manager.Queue()
+    stop = _manager.Event()
+    future = loop.run_in_executor(_workflow_pool, stream_graph_in_worker, initial_state, events, stop)
+    # Poll with a timeout so a crashed worker can't leave us waiting forever
+    get_event = functools.partial(events.get, timeout=1.0)
+    try:
+        while True:
+            try:
+                kind, payload = await loop.run_in_executor(None, get_event)
+            except queue.Empty:
+                if future.done():
+                    future.result()         # re-raises e.g. BrokenProcessPool
+                    return
+                continue
+            if kind == "event":
+                yield payload
+            elif kind == "error":
+                raise RuntimeError(payload)
+            else:
+                return
+    finally:
+        stop.set()              # consumer gone (e.g. approval pause) – wind down
+
+
 async def run_campaign_workflow(campaign_id: str, raw_input: str):
+    """
+    Run the full LangGraph workflow once an admission slot is free.
+    """
+    async with WORKFLOW_SEM:
+        await _run_workflow(campaign_id, raw_input)
+
+
+# ---------------------------------------------------------------------------
+# Bounded backlog  –  endpoints submit here instead of BackgroundTasks, so
+# queued work is capped (callers get a 503 when full) and a hung workflow
+# only ties up its own worker.
+# ---------------------------------------------------------------------------
+_backlog: asyncio.Queue | None = None
+_backlog_workers: list[asyncio.Task] = []
+
+
+async def _backlog_worker():
+    while True:
+        campaign_id, raw_input = await _backlog.get()
+        try:
+            await run_campaign_workflow(campaign_id, raw_input)
+        except Exception as exc:
+            logger.error(f"Campaign {campaign_id} worker error: {exc}", exc_info=True)
+        finally:
+            _backlog.task_done()
+
+
+def start_workflow_workers() -> None:
+    """Create the backlog and its worker tasks (needs a running loop)."""
+    global _backlog
+    if _backlog is not None:
+        return
+    _backlog = asyncio.Queue(maxsize=settings.workflow_backlog_size)
+    _backlog_workers.extend(
+        asyncio.create_task(_backlog_worker())
+        for _ in range(settings.max_concurrent_workflows)
+    )
+
+
+def workflow_backlog_full() -> bool:
+    return _backlog is not None and _backlog.full()
+
+
+def submit_campaign_workflow(campaign_id: str, raw_input: str) -> None:
+    """Queue a campaign run.  Raises asyncio.QueueFull if the backlog is full."""
+    start_workflow_workers()
+    _backlog.put_nowait((campaign_id, raw_input))
+
+
+# Graph node -> UI stage. Drafting nodes are dispatched in _run_workflow;
+# anything not listed here reports under its own node name.
+_STAGE_MAP = {
+    "ingestion": "ingestion",
+    "persona": "persona",
+    "scoring": "scoring",
+    "approval": "approval",
+    "execution": "execution",
+    "persistence": "persistence",
+}
+
+
+async def _run_workflow(campaign_id: str, raw_input: str):
     """
     Run the full LangGraph workflow asynchronously with stage updates.
     """
     try:
-        # Build the graph
-        graph = build_graph().compile()
-        
         # Initial state
         initial_state = {"raw_input": raw_input}
         
-        # Stage mapping
-        stage_map = {
-            "ingestion": "ingestion",
-            "persona": "persona",
-            "draft_email": "drafting",
-            "draft_sms": "drafting",
-            "draft_linkedin": "drafting",
-            "draft_instagram": "drafting",
-            "scoring": "scoring",
-            "approval": "approval",
-            "execution": "execution",
-            "persistence": "persistence",
-        }
-        
         current_drafting = False
         
-        # Stream through the workflow
-        async for event in graph.astream(initial_state):
-            logger.info(f"Campaign {campaign_id} event: {list(event.keys())}")
-            
-            for node_name, node_state in event.items():
-                # Map node to stage
-                stage = stage_map.get(node_name, node_name)
+        # Stream through the workflow (aclosing: stop the worker-process
+        # run, if any, as soon as we return at the approval pause)
+        async with aclosing(_graph_events(initial_state)) as events:
+            async for event in events:
+                logger.info(f"Campaign {campaign_id} event: {list(event.keys())}")
                 
-                # Handle drafting nodes specially (all 4 run in parallel)
-                if stage == "drafting":
-                    if not current_drafting:
+                for node_name, node_state in event.items():
+                    match node_name:
+                        # Drafting nodes run in parallel; announce the stage once
+                        case "draft_email" | "draft_sms" | "draft_linkedin" | "draft_instagram" | "draft_whatsapp":
+                            stage = "drafting"
+                            if not current_drafting:
+                                state_manager.update_stage(
+                                    campaign_id, "drafting", "running",
+                                    "Generating personalized drafts for all channels..."
+                                )
+                                current_drafting = True
+                        case _:
+                            stage = _STAGE_MAP.get(node_name, node_name)
+                            current_drafting = False
+                            state_manager.update_stage(
+                                campaign_id, stage, "running",
+                                f"Processing {stage}..."
+                            )
+                    
+                    # Update full state
+                    state_manager.update_state(campaign_id, node_state)
+                    
+                    # Check if we need approval (interrupt point)
+                    if node_name == "approval" and node_state.get("drafts"):
                         state_manager.update_stage(
-                            campaign_id, "drafting", "running",
-                            "Generating personalized drafts for all channels..."
+                            campaign_id, "approval", "waiting",
+                            "Waiting for user approval..."
                         )
-                        current_drafting = True
-                else:
-                    current_drafting = False
-                    state_manager.update_stage(
-                        campaign_id, stage, "running",
-                        f"Processing {stage}..."
-                    )
-                
-                # Update full state
-                state_manager.update_state(campaign_id, node_state)
-                
-                # Check if we need approval (interrupt point)
-                if node_name == "approval" and node_state.get("drafts"):
-                    state_manager.update_stage(
-                        campaign_id, "approval", "waiting",
-                        "Waiting for user approval..."
-                    )
-                    # Pause here - frontend will handle approval
-                    return
-                
-                # Mark stage as completed
-                if stage != "drafting" or (stage == "drafting" and "draft_instagram" in event):
-                    state_manager.update_stage(
-                        campaign_id, stage, "completed",
-                        f"{stage.capitalize()} completed"
-                    )
-        
+                        # Pause here - frontend will handle approval
+                        return
+                    
+                    # Mark stage as completed
+                    if stage != "drafting" or (stage == "drafting" and "draft_instagram" in event):
+                        state_manager.update_stage(
+                            campaign_id, stage, "completed",
+                            f"{stage.capitalize()} completed"
+                        )
+            
         # Final update
         campaign = state_manager.get_campaign(campaign_id)
         if campaign:
@@ -93,15 +223,13 @@ async def run_campaign_workflow(campaign_id: str, raw_input: str):
                     campaign_id, "persistence", "completed",
                     "Campaign completed successfully"
                 )
-                campaign["status"] = "completed"
+                state_manager.mark_finished(campaign_id, "completed")
             
     except Exception as exc:
         logger.error(f"Campaign {campaign_id} failed: {exc}", exc_info=True)
+        campaign = state_manager.get_campaign(campaign_id)
         state_manager.update_stage(
-            campaign_id, state_manager.get_campaign(campaign_id)["current_stage"],
+            campaign_id, campaign["current_stage"] if campaign else "pending",
             "failed", str(exc)
         )
-        campaign = state_manager.get_campaign(campaign_id)
-        if campaign:
-            campaign["status"] = "failed"
-            campaign["error"] = str(exc)
+        state_manager.mark_finished(campaign_id, "failed", error=str(exc))
@@ -6,6 +6,7 @@ Reads from environment (and .env via python-dotenv).
 """
 
 from __future__ import annotations
+from typing import Literal
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -21,6 +22,12 @@ class PostgresSettings(BaseSettings):
     host:     str = "localhost"
     port:     int = 5432
 
+    # ── connection pool (async engine) ─────────────────────────────────
+    pool_size:    int = 10
+    max_overflow: int = 20
+    pool_timeout: int = 30              # seconds to wait for a free connection
+    pool_recycle: int = 1800            # seconds before a connection is replaced
+
     @property
     def async_url(self) -> str:
         return (
@@ -81,6 +88,23 @@ class Settings(BaseSettings):
 
     log_level: str = "INFO"
 
+    # "sha256" (default) or "blake3" – changing it breaks matching against
+    # target_hash values already stored, so pick one per database.  Anything
+    # else is rejected at startup rather than silently hashed as SHA-256.
+    target_hash_algo: Literal["sha256", "blake3"] = "sha256"
+
+    # ── API / SSE ─────────────────────────────────────────────────────
+    sse_max_queue_size: int = 1000          # per-subscriber event buffer
+    max_campaigns:        int = 500         # in-memory LRU cap
+    campaign_ttl_seconds: int = 3600        # idle campaigns evicted after this
+    max_concurrent_workflows: int = 8       # in-flight LangGraph runs
+    workflow_process_workers: int = 0       # >0 runs graphs in a process pool
+    workflow_backlog_size:    int = 100     # queued campaigns before 503
+
+    # ── Send idempotency ──────────────────────────────────────────────
+    send_dedupe_ttl_seconds: int = 3600     # identical sends suppressed for this long
+    idempotency_redis_url:   str = ""       # e.g. redis://localhost:6379/0; empty = in-process
+
     model_config = {"env_file": ".env", "extra": "ignore"}
 
 
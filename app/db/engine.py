@@ -3,30 +3,81 @@ app/db/engine.py
 ────────────────
 SQLAlchemy async engine & session factory.
 Every module that needs a DB connection imports `get_session`.
+
+Sync callers (LangGraph nodes) run their DB coroutines through `run_db`,
+which executes them on one long-lived event loop.  asyncpg connections
+are bound to the loop that opened them, so the pool is only ever used
+from that loop – connections are reused and never cross loops.
 """
 
 from __future__ import annotations
+import asyncio
+import threading
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Coroutine
 
+from sqlalchemy import Engine, create_engine
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     create_async_engine,
     async_sessionmaker,
 )
-from sqlalchemy.pool import NullPool
-
 from app.config import settings
 
 # ---------------------------------------------------------------------------
-# Engine  (NullPool keeps it simple for a single-process CLI tool)
+# Engine  (pooled – warm connections are reused instead of reconnecting
+# on every session; LIFO keeps the hot few busy so idle ones can expire)
 # ---------------------------------------------------------------------------
 engine = create_async_engine(
     settings.postgres.async_url,
-    pool_class=NullPool,
+    pool_size=settings.postgres.pool_size,
+    max_overflow=settings.postgres.max_overflow,
+    pool_timeout=settings.postgres.pool_timeout,
+    pool_recycle=settings.postgres.pool_recycle,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
     echo=False,
 )
 
+# ---------------------------------------------------------------------------
+# Sync engine  (Alembic needs the sync driver – built once, on first use)
+# ---------------------------------------------------------------------------
+_sync_engine: Engine | None = None
+
+
+def get_sync_engine() -> Engine:
+    global _sync_engine
+    if _sync_engine is None:
+        _sync_engine = create_engine(
+            settings.postgres.sync_url,
+            pool_pre_ping=True,
+            echo=False,
+        )
+    return _sync_engine
+
+
+# ---------------------------------------------------------------------------
+# DB event loop  (one per process, on a daemon thread, started on first use)
+# ---------------------------------------------------------------------------
+_db_loop: asyncio.AbstractEventLoop | None = None
+_db_loop_lock = threading.Lock()
+
+
+def _get_db_loop() -> asyncio.AbstractEventLoop:
+    global _db_loop
+    with _db_loop_lock:
+        if _db_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="db-loop", daemon=True).start()
+            _db_loop = loop
+    return _db_loop
+
+
+def run_db(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run `coro` on the DB loop from sync code and block for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_db_loop()).result()
+
+
 # ---------------------------------------------------------------------------
 # Session factory
 # ---------------------------------------------------------------------------
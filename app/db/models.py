@@ -6,11 +6,11 @@ SQLAlchemy ORM models.
 PII POLICY (enforced here):
   – No full names, phone numbers, personal emails, or home addresses.
   – We store:
-      • A hashed, opaque `target_id` (SHA-256 of email/LinkedIn URL)
+      • A hashed, opaque `target_id` (SHA-256 / BLAKE3 of email/LinkedIn URL)
         so we can reference the same target again without storing the PII.
       • Company, role, industry  – public business info.
       • Tone metadata, important links, drafts, scores.
-      • Timestamps for audit / TTL.
+      • Timestamps for audit / TTL  (stamped by Postgres, stored as UTC).
 
   The sanitizer (app/utils/sanitizer.py) is the gate that produces
   the payload that lands here.
@@ -23,6 +23,7 @@ from datetime import datetime
 from sqlalchemy import (
     Column, String, Text, Integer, Float,
     DateTime, Boolean, ForeignKey, JSON,
+    Index, text, func,
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import DeclarativeBase, relationship
@@ -59,8 +60,8 @@ class TargetProfile(Base):
     # example:  {"linkedin": "https://linkedin.com/in/xxx",
     #            "company_site": "https://acme.com"}
 
-    created_at: datetime = Column(DateTime, default=datetime.utcnow)
-    updated_at: datetime = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: datetime = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at: datetime = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # ── relationships ────────────────────────────────────────────────────
     persona  = relationship("PersonaRecord",  back_populates="target", uselist=False)
@@ -87,7 +88,7 @@ class PersonaRecord(Base):
     # full structured tone JSON produced by persona_agent
     tone_json: dict | None = Column(JSON, nullable=True)
 
-    created_at: datetime = Column(DateTime, default=datetime.utcnow)
+    created_at: datetime = Column(DateTime(timezone=True), server_default=func.now())
 
     target = relationship("TargetProfile", back_populates="persona")
 
@@ -97,6 +98,10 @@ class PersonaRecord(Base):
 # ---------------------------------------------------------------------------
 class DraftRecord(Base):
     __tablename__ = "draft_records"
+    __table_args__ = (
+        Index("ix_draft_run_channel",    "run_id",    "channel"),
+        Index("ix_draft_target_created", "target_id", "created_at"),
+    )
 
     id:        uuid.UUID = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     target_id: uuid.UUID = Column(PG_UUID(as_uuid=True), ForeignKey("target_profiles.id"), nullable=False)
@@ -109,7 +114,7 @@ class DraftRecord(Base):
     approved:  bool = Column(Boolean, default=False)
     sent:      bool = Column(Boolean, default=False)
 
-    created_at: datetime = Column(DateTime, default=datetime.utcnow)
+    created_at: datetime = Column(DateTime(timezone=True), server_default=func.now())
 
     target = relationship("TargetProfile", back_populates="drafts")
     run    = relationship("OutreachRun",    back_populates="drafts")
@@ -120,6 +125,13 @@ class DraftRecord(Base):
 # ---------------------------------------------------------------------------
 class OutreachRun(Base):
     __tablename__ = "outreach_runs"
+    __table_args__ = (
+        # partial index – only the small set of in-flight runs
+        Index(
+            "ix_run_active", "target_id",
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+    )
 
     id:        uuid.UUID = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     target_id: uuid.UUID = Column(PG_UUID(as_uuid=True), ForeignKey("target_profiles.id"), nullable=False)
@@ -129,8 +141,8 @@ class OutreachRun(Base):
 
     error_message: str | None = Column(Text, nullable=True)
 
-    started_at:  datetime       = Column(DateTime, default=datetime.utcnow)
-    completed_at: datetime | None = Column(DateTime, nullable=True)
+    started_at:  datetime       = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at: datetime | None = Column(DateTime(timezone=True), nullable=True)
 
     target = relationship("TargetProfile", back_populates="runs")
     drafts = relationship("DraftRecord",    back_populates="run")
@@ -69,6 +69,27 @@ class Draft(TypedDict):
     llm_action_id: str | None   # links to the LLM action that created it
 
 
+class DraftsSoA(TypedDict):
+    """
+    Column (struct-of-arrays) view of a list[Draft]: one list per field,
+    all the same length, indexed by draft position.  Passes that only touch
+    one or two fields (channel, score, approved) scan those lists directly.
+    State keeps the AoS form; convert at node boundaries.
+    """
+    id: list[str]
+    channel: list[str]
+    subject: list[str | None]
+    body: list[str]
+    score: list[float | None]
+    score_rationale: list[str | None]
+    approved: list[bool]
+    sent: list[bool]
+    version: list[int]
+    regenerate_count: list[int]
+    created_at: list[str]
+    llm_action_id: list[str | None]
+
+
 class PersonaProfile(TypedDict):
     """Structured persona extracted from target profile."""
     name: str
@@ -100,7 +121,7 @@ class OutreachState(TypedDict, total=False):
 
     # ── stable identifiers (ingestion → persistence) ───────────────────
     target_identifier: str      # original input (URL / email) – NOT stored in DB
-    target_hash: str            # SHA-256 of target_identifier
+    target_hash: bytes          # raw 32-byte digest of target_identifier (hex only at the DB boundary)
 
     # ── public business info ────────────────────────────────────────────
     company: str
@@ -194,6 +215,23 @@ def create_draft(
     )
 
 
+def aos_to_soa(drafts: list[Draft], fields: tuple[str, ...] | None = None) -> DraftsSoA:
+    """
+    Split a list of drafts into parallel per-field lists.  Pass `fields` to
+    build only the columns a pass needs (the result is then partial).
+    """
+    return DraftsSoA(**{
+        field: [d.get(field) for d in drafts]
+        for field in (fields or DraftsSoA.__annotations__)
+    })
+
+
+def soa_to_aos(soa: DraftsSoA) -> list[Draft]:
+    """Rebuild the list of drafts from parallel per-field lists."""
+    fields = list(DraftsSoA.__annotations__)
+    return [Draft(zip(fields, row)) for row in zip(*(soa[f] for f in fields))]
+
+
 def create_initial_state(
     run_id: str,
     session_id: str,
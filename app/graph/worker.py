@@ -0,0 +1,28 @@
+"""
+app/graph/worker.py
+───────────────────
+Worker-process entry point for running the graph out of the API process
+(see app/api/workflow_runner.py, WORKFLOW_PROCESS_WORKERS > 0).
+
+Spawned workers import this module by name, so it deliberately imports
+only the graph – nothing from app.api, whose StateManager singleton would
+otherwise load every session file into each worker.
+"""
+
+from __future__ import annotations
+from typing import Any
+
+from app.graph.workflow import get_compiled_graph
+
+
+def stream_graph_in_worker(initial_state: dict[str, Any], events: Any, stop: Any) -> None:
+    """Run the graph, forwarding every event as ("event", e), then ("done", None) or ("error", msg)."""
+    try:
+        for event in get_compiled_graph().stream(initial_state):
+            events.put(("event", event))
+            if stop.is_set():
+                break
+    except Exception as exc:
+        events.put(("error", str(exc)))
+        return
+    events.put(("done", None))
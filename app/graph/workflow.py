@@ -45,6 +45,7 @@ A max-regen counter prevents infinite loops.
 """
 
 from __future__ import annotations
+import functools
 import logging
 
 from langgraph.graph import StateGraph, START, END
@@ -189,3 +190,12 @@ def build_graph() -> StateGraph:
     compiled = graph.compile()
     logger.info("LangGraph compiled: nodes=%s", list(graph.nodes))
     return compiled
+
+
+@functools.lru_cache(maxsize=1)
+def get_compiled_graph():
+    """
+    Process-wide compiled graph.  The topology never changes at runtime,
+    so compile once and share it across every run.
+    """
+    return build_graph()
@@ -4,14 +4,19 @@ app/tools/gmail_tool.py
 Real Gmail send via langchain-google-community.
 
 Handles OAuth credential flow (credentials.json → token.json) the
-first time and caches the token for subsequent runs.
+first time and caches the token for subsequent runs.  Access tokens are
+refreshed only when they are (about to be) expired, and the refreshed
+token is written back to token.json so the next process starts warm.
 """
 
 from __future__ import annotations
 import logging
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
 from app.config import settings
+from app.utils.idempotency import idempotent
 
 logger = logging.getLogger(__name__)
 
@@ -21,11 +26,35 @@ logger = logging.getLogger(__name__)
 # configured – e.g. during unit tests or CI)
 # ---------------------------------------------------------------------------
 _gmail_send_tool = None
+_credentials = None
+
+# Refresh this long before the access token actually expires, so a send
+# never races the expiry.
+_REFRESH_MARGIN = timedelta(seconds=60)
+
+
+def _refresh_credentials(credentials: Any) -> None:
+    """Refresh the access token and persist it back to token.json."""
+    from google.auth.transport.requests import Request
+
+    credentials.refresh(Request())
+    Path(settings.gmail.token_path).write_text(credentials.to_json())
+    logger.info("Gmail credentials refreshed.")
+
+
+def _ensure_fresh() -> None:
+    """Refresh the cached credentials only if they expire within the margin."""
+    creds = _credentials
+    if creds is None or not creds.refresh_token or creds.expiry is None:
+        return
+    # google-auth keeps `expiry` as naive UTC
+    if creds.expiry - datetime.utcnow() < _REFRESH_MARGIN:
+        _refresh_credentials(creds)
 
 
 def _init_gmail() -> Any:
     """Build and cache the GmailSendMessage tool."""
-    global _gmail_send_tool
+    global _gmail_send_tool, _credentials
     if _gmail_send_tool is not None:
         return _gmail_send_tool
 
@@ -40,6 +69,10 @@ def _init_gmail() -> Any:
         scopes=["https://mail.google.com/"],
         client_secrets_file=settings.gmail.credentials_path,
     )
+    if credentials.expired and credentials.refresh_token:
+        _refresh_credentials(credentials)
+    _credentials = credentials
+
     api_resource = build_resource_service(credentials=credentials)
     _gmail_send_tool = GmailSendMessage(api_resource=api_resource)
     logger.info("Gmail tool initialised.")
@@ -50,6 +83,7 @@ def _init_gmail() -> Any:
 # Public API
 # ---------------------------------------------------------------------------
 
+@idempotent("email")
 def send_gmail(to: str, subject: str, body: str) -> dict[str, Any]:
     """
     Send a real email via Gmail.
@@ -61,6 +95,7 @@ def send_gmail(to: str, subject: str, body: str) -> dict[str, Any]:
     """
     try:
         tool = _init_gmail()
+        _ensure_fresh()
         result = tool.invoke({
             "to":      [to],
             "subject": subject,
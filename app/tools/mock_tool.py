@@ -26,24 +26,28 @@ def mock_send(channel: str, to: str, body: str, subject: str | None = None) -> d
     Returns the same dict shape as gmail_tool / twilio_tool.
     """
     separator = "=" * 60
-    logger.info(separator)
-    logger.info("  [MOCK SEND] Channel  : %s", channel.upper())
-    logger.info("  [MOCK SEND] To       : %s", to)
-    if subject:
-        logger.info("  [MOCK SEND] Subject  : %s", subject)
-    logger.info("  [MOCK SEND] Body     :")
-    for line in body.splitlines():
-        logger.info("                %s", line)
-    logger.info(separator)
+
+    # One record / one write per send instead of one per body line
+    if logger.isEnabledFor(logging.INFO):
+        subject_line = f"  [MOCK SEND] Subject  : {subject}\n" if subject else ""
+        body_block = "\n".join(f"                {line}" for line in body.splitlines())
+        logger.info(
+            "%s\n  [MOCK SEND] Channel  : %s\n  [MOCK SEND] To       : %s\n"
+            "%s  [MOCK SEND] Body     :\n%s\n%s",
+            separator, channel.upper(), to, subject_line, body_block, separator,
+        )
 
     # Also print to stdout so it's visible even if logging goes to file
-    print(f"\n{separator}")
-    print(f"  [MOCK – {channel.upper()}]")
-    print(f"  To      : {to}")
-    if subject:
-        print(f"  Subject : {subject}")
-    print(f"  Body    :\n{body}")
-    print(separator, end="\n\n")
+    subject_line = f"  Subject : {subject}\n" if subject else ""
+    print(
+        f"\n{separator}\n"
+        f"  [MOCK – {channel.upper()}]\n"
+        f"  To      : {to}\n"
+        f"{subject_line}"
+        f"  Body    :\n{body}\n"
+        f"{separator}",
+        end="\n\n",
+    )
 
     return {
         "status":  "mock_sent",
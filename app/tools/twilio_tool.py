@@ -4,17 +4,63 @@ app/tools/twilio_tool.py
 Real SMS send via Twilio.
 
 Reads credentials from settings (TWILIO_ACCOUNT_SID, AUTH_TOKEN, FROM_NUMBER).
+
+send_sms_bulk() fans a batch out over a small thread pool, throttled by a
+token bucket so the account's messages-per-second limit is respected.
 """
 
 from __future__ import annotations
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from app.config import settings
+from app.utils.idempotency import idempotent
 
 logger = logging.getLogger(__name__)
 
 
+# ---------------------------------------------------------------------------
+# Lazy-init: one Client per process so its HTTP session (keep-alive, TLS)
+# is reused across sends.  twilio is imported lazily like the Gmail tool.
+# ---------------------------------------------------------------------------
+_client = None
+
+
+def _get_client() -> Any:
+    global _client
+    if _client is None:
+        from twilio.rest import Client
+        _client = Client(settings.twilio.account_sid, settings.twilio.auth_token)
+    return _client
+
+
+def _credentials_configured() -> bool:
+    return all([
+        settings.twilio.account_sid,
+        settings.twilio.auth_token,
+        settings.twilio.from_number,
+    ])
+
+
+def _create_message(to_number: str, body: str) -> dict[str, Any]:
+    """Send one SMS; raises on any Twilio / transport error."""
+    message = _get_client().messages.create(
+        body=body,
+        from_=settings.twilio.from_number,
+        to=to_number,
+    )
+    logger.info("SMS sent to %s – SID: %s", to_number, message.sid)
+    return {
+        "status": "sent",
+        "sid":    message.sid,
+        "to":     to_number,
+    }
+
+
+@idempotent("sms")
 def send_sms(to_number: str, body: str) -> dict[str, Any]:
     """
     Send a real SMS via Twilio.
@@ -28,29 +74,106 @@ def send_sms(to_number: str, body: str) -> dict[str, Any]:
         or
         {"status": "error", "error": <str>}
     """
-    if not all([
-        settings.twilio.account_sid,
-        settings.twilio.auth_token,
-        settings.twilio.from_number,
-    ]):
+    if not _credentials_configured():
         logger.warning("Twilio credentials not configured – SMS not sent.")
         return {"status": "error", "error": "Twilio credentials missing in .env"}
 
     try:
-        from twilio.rest import Client
-
-        client = Client(settings.twilio.account_sid, settings.twilio.auth_token)
-        message = client.messages.create(
-            body=body,
-            from_=settings.twilio.from_number,
-            to=to_number,
-        )
-        logger.info("SMS sent to %s – SID: %s", to_number, message.sid)
-        return {
-            "status": "sent",
-            "sid":    message.sid,
-            "to":     to_number,
-        }
+        return _create_message(to_number, body)
     except Exception as exc:
         logger.error("Twilio send failed: %s", exc, exc_info=True)
         return {"status": "error", "error": str(exc)}
+
+
+# ---------------------------------------------------------------------------
+# Bulk send
+# ---------------------------------------------------------------------------
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, bursting up to
+    `capacity`.  Use as a context manager – entering blocks until a token
+    is available.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0, got {rate}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def __enter__(self) -> "_TokenBucket":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+MAX_429_RETRIES = 3
+
+
+# Keyed like send_sms(), so a bulk send and a single send of the same
+# message dedupe against each other
+@idempotent("sms", key_args=("to_number", "body"))
+def _send_throttled(to_number: str, body: str, bucket: _TokenBucket) -> dict[str, Any]:
+    """One bulk item: wait for a token, send, and back off on HTTP 429."""
+    for attempt in range(MAX_429_RETRIES + 1):
+        try:
+            with bucket:
+                return _create_message(to_number, body)
+        except Exception as exc:
+            if getattr(exc, "status", None) != 429 or attempt == MAX_429_RETRIES:
+                logger.error("Twilio send to %s failed: %s", to_number, exc)
+                return {"status": "error", "error": str(exc), "to": to_number}
+            retry_after = 2 ** attempt
+            logger.warning(
+                "Twilio rate limited (429) – retry %d/%d in %ds",
+                attempt + 1, MAX_429_RETRIES, retry_after,
+            )
+            time.sleep(retry_after)
+
+
+def send_sms_bulk(
+    pairs: list[tuple[str, str]],
+    max_concurrency: int = 5,
+    rate_per_sec: float = 1.0,
+) -> list[dict[str, Any]]:
+    """
+    Send many SMS concurrently.
+
+    Args:
+        pairs           – [(to_number, body), ...]
+        max_concurrency – worker threads / in-flight requests
+        rate_per_sec    – account messages-per-second limit (Twilio long
+                          codes default to 1 MPS); must be > 0.  Bursts
+                          are capped at one second's worth of sends.
+
+    Returns one result dict per pair, in input order, shaped like send_sms().
+    """
+    if rate_per_sec <= 0:
+        raise ValueError(f"rate_per_sec must be > 0, got {rate_per_sec}")
+    if not _credentials_configured():
+        logger.warning("Twilio credentials not configured – %d SMS not sent.", len(pairs))
+        return [{"status": "error", "error": "Twilio credentials missing in .env"} for _ in pairs]
+
+    # Burst = one second's allowance, never more – extra workers just wait
+    bucket = _TokenBucket(rate_per_sec, capacity=max(1, int(rate_per_sec)))
+    with ThreadPoolExecutor(max_workers=max_concurrency) as ex:
+        futs = [ex.submit(_send_throttled, to, body, bucket) for to, body in pairs]
+        return [f.result() for f in futs]
@@ -0,0 +1,224 @@
+"""
+app/utils/idempotency.py
+────────────────────────
+Duplicate-send guard for the real send tools (Gmail, Twilio).
+
+`@idempotent(channel)` keys each call on the SHA-256 of an unambiguous JSON
+encoding of the channel and the call's named arguments – i.e. recipient +
+content – and, within the TTL, returns the first successful result instead
+of sending again.  Only successful sends are remembered, so a failed send
+can still be retried.
+
+The key is reserved *before* sending: an identical call that arrives while
+the first is still in flight waits for its outcome instead of sending too.
+
+The store is an in-process LRU by default.  When IDEMPOTENCY_REDIS_URL is
+set (and the optional `redis` package is installed) it is shared through
+Redis instead, so re-runs from other processes are caught too.
+"""
+
+from __future__ import annotations
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Results worth replaying; anything else (errors) falls through to a resend
+_SUCCESS_STATUSES = ("sent",)
+
+# Cap on remembered sends in the in-process store
+MAX_ENTRIES = 10_000
+
+# Longest an identical call waits on an in-flight send (seconds); also the
+# lifetime of a Redis reservation, so a crashed sender can't block forever
+PENDING_TIMEOUT = 300
+
+# Redis value marking a reserved, not-yet-finished send
+_PENDING = b"pending"
+
+
+# ---------------------------------------------------------------------------
+# Stores
+# ---------------------------------------------------------------------------
+
+class _MemoryStore:
+    """Thread-safe LRU of key → (expires_at, result), plus in-flight reservations."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._pending: dict[bytes, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _get_locked(self, key: bytes) -> dict[str, Any] | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return result
+
+    def claim(self, key: bytes, timeout: float) -> dict[str, Any] | None:
+        """
+        Return the remembered result, or reserve the key and return None.
+        Waits (up to `timeout`) while another call holds the reservation;
+        raises TimeoutError if it is still held after that.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                result = self._get_locked(key)
+                if result is not None:
+                    return result
+                done = self._pending.get(key)
+                if done is None:
+                    self._pending[key] = threading.Event()
+                    return None
+            if not done.wait(max(0.0, deadline - time.monotonic())):
+                raise TimeoutError
+
+    def set(self, key: bytes, result: dict[str, Any], ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, result)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            done = self._pending.pop(key, None)
+        if done:
+            done.set()
+
+    def release(self, key: bytes) -> None:
+        with self._lock:
+            done = self._pending.pop(key, None)
+        if done:
+            done.set()
+
+
+class _RedisStore:
+    """`idem:<hex key>` → JSON result (or a pending marker), expiring after the TTL."""
+
+    # Poll interval while another process holds the reservation
+    POLL_INTERVAL = 0.2
+
+    def __init__(self, url: str):
+        import redis                        # optional dependency
+        self._redis = redis.Redis.from_url(url)
+
+    def claim(self, key: bytes, timeout: float) -> dict[str, Any] | None:
+        name = f"idem:{key.hex()}"
+        deadline = time.monotonic() + timeout
+        while True:
+            # SET NX is the reservation: exactly one caller gets True
+            if self._redis.set(name, _PENDING, nx=True, ex=PENDING_TIMEOUT):
+                return None
+            raw = self._redis.get(name)
+            if raw and raw != _PENDING:
+                return json.loads(raw)
+            if raw is None:
+                continue                    # released or expired meanwhile – retry
+            if time.monotonic() >= deadline:
+                raise TimeoutError
+            time.sleep(self.POLL_INTERVAL)
+
+    def set(self, key: bytes, result: dict[str, Any], ttl: int) -> None:
+        # We hold the reservation, so overwrite the pending marker
+        self._redis.set(f"idem:{key.hex()}", json.dumps(result, default=str), ex=ttl)
+
+    def release(self, key: bytes) -> None:
+        self._redis.delete(f"idem:{key.hex()}")
+
+
+_store: _MemoryStore | _RedisStore | None = None
+
+
+def _get_store() -> _MemoryStore | _RedisStore:
+    global _store
+    if _store is None:
+        if settings.idempotency_redis_url:
+            _store = _RedisStore(settings.idempotency_redis_url)
+            logger.info("Idempotency store: Redis.")
+        else:
+            _store = _MemoryStore()
+    return _store
+
+
+# ---------------------------------------------------------------------------
+# Decorator
+# ---------------------------------------------------------------------------
+
+def _idempotency_key(channel: str, fields: dict[str, Any]) -> bytes:
+    # JSON keeps field boundaries explicit, so no two different messages
+    # can serialise to the same material (unlike joining on a separator)
+    material = json.dumps([channel, fields], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8"), usedforsecurity=False).digest()
+
+
+def idempotent(
+    channel: str,
+    ttl: int | None = None,
+    key_args: tuple[str, ...] | None = None,
+) -> Callable:
+    """
+    Skip repeat calls with the same channel + arguments within `ttl` seconds
+    (default: settings.send_dedupe_ttl_seconds), returning the cached result
+    with "deduplicated": True added.  A concurrent identical call waits for
+    the in-flight one rather than sending in parallel.
+
+    `key_args` limits the key to those argument names (default: all), so a
+    helper with extra plumbing arguments can share keys with the public
+    send function.
+    """
+    def decorator(func: Callable[..., dict[str, Any]]) -> Callable[..., dict[str, Any]]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            fields = dict(bound.arguments)
+            if key_args is not None:
+                fields = {name: fields[name] for name in key_args}
+            key = _idempotency_key(channel, fields)
+
+            store = _get_store()
+            try:
+                cached = store.claim(key, PENDING_TIMEOUT)
+                reserved = True
+            except TimeoutError:
+                logger.warning("[%s] Identical send still in flight – not sending again.", channel.upper())
+                return {"status": "error", "error": "identical send already in flight"}
+            except Exception as exc:
+                logger.warning("Idempotency lookup failed (%s) – sending anyway.", exc)
+                cached, reserved = None, False
+            if cached is not None:
+                logger.info("[%s] Duplicate send suppressed (idempotency hit).", channel.upper())
+                return {**cached, "deduplicated": True}
+
+            result: dict[str, Any] | None = None
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                if reserved:
+                    try:
+                        if result is not None and result.get("status") in _SUCCESS_STATUSES:
+                            store.set(key, result, ttl if ttl is not None else settings.send_dedupe_ttl_seconds)
+                        else:
+                            store.release(key)      # failed – let a retry through
+                    except Exception as exc:
+                        logger.warning("Idempotency record failed: %s", exc)
+            return result
+
+        return wrapper
+    return decorator
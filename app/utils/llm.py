@@ -7,6 +7,8 @@ LLM utility functions - connection checking, health status, model info.
 from __future__ import annotations
 import httpx
 import logging
+import random
+import time
 from typing import Dict, Any, List, Optional
 
 from app.config import settings
@@ -24,6 +26,43 @@ class ModelNotFoundError(Exception):
     pass
 
 
+# Status codes worth retrying: the server is shedding load, not rejecting us.
+_RETRYABLE_STATUS = (429, 503)
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    """Best-effort HTTP status off an ollama / httpx error."""
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code
+
+
+def invoke_with_backoff(
+    llm: Any,
+    prompt: str,
+    max_retries: int = 4,
+    base_delay: float = 1.0,
+) -> str:
+    """
+    Call llm.invoke(prompt), retrying with jittered exponential backoff when
+    the server is rate limiting (429) or overloaded (503).  Any other error,
+    or the last failed attempt, is re-raised unchanged.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return llm.invoke(prompt)
+        except Exception as exc:
+            if _status_code(exc) not in _RETRYABLE_STATUS or attempt == max_retries:
+                raise
+            delay = base_delay * (2 ** attempt) * (0.5 + random.random())
+            logger.warning(
+                "LLM busy (HTTP %s) – retry %d/%d in %.1fs",
+                _status_code(exc), attempt + 1, max_retries, delay,
+            )
+            time.sleep(delay)
+
+
 async def check_ollama_health() -> Dict[str, Any]:
     """
     Check if Ollama is running and the configured model is available.
@@ -12,38 +12,104 @@ What we STRIP:
     home / mailing addresses, date of birth, SSNs, any free-text
     that regex flags as PII.
 
-The opaque `target_hash` (SHA-256 of the original identifier the user
-supplied) lets us correlate rows without ever storing the identifier itself.
+The opaque `target_hash` (SHA-256 – or BLAKE3 when TARGET_HASH_ALGO=blake3 –
+of the original identifier the user supplied) lets us correlate rows without
+ever storing the identifier itself.
 """
 
 from __future__ import annotations
 import hashlib
 import re
 import logging
-from typing import Any
+from typing import Any, Callable
+
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Regex patterns for common PII tokens
 # ---------------------------------------------------------------------------
-_PHONE_RE  = re.compile(r"(\+?\d[\d\s\-\(\)]{7,}\d)")
-_EMAIL_RE  = re.compile(r"[\w.\-+]+@[\w.\-]+\.\w{2,}")
+# Phone and email fused into one alternation so scrubbing is a single pass;
+# `lastgroup` tells the replacer which one matched.  The email alternative
+# may only start at the beginning of a run of local-part characters: without
+# the lookbehind every position inside a long token (base64 blob, API key)
+# re-scans the rest of it looking for an "@", which is quadratic.  (Cost:
+# an email glued straight onto a phone number, "4155551234jo@x.com", only
+# has the phone redacted.)
+_PII_RE    = re.compile(
+    r"(?P<phone>\+?\d[\d\s\-\(\)]{7,}\d)"
+    r"|(?P<email>(?<![\w.\-+])[\w.\-+]+@[\w.\-]+\.\w{2,})"
+)
+_PII_REPLACEMENTS = {"phone": "[REDACTED-PHONE]", "email": "[REDACTED-EMAIL]"}
 # Title-Case word sequences of 2-4 words (rough name pattern)
 # We'll check context separately to avoid company names
 _NAME_RE   = re.compile(r"\b([A-Z][a-z]+(?:\s[A-Z][a-z]+){1,3})\b")
 
 
+def compute_target_hash_bytes(identifier: str) -> bytes:
+    """
+    Raw 32-byte digest of the identifier – half the size of the hex form,
+    for callers that only compare hashes (dict / set keys).
+    """
+    data = identifier.strip().encode("utf-8")
+    if settings.target_hash_algo == "blake3":
+        import blake3                       # optional dependency
+        return blake3.blake3(data).digest()
+    # Not a security boundary (an opaque correlation key), so skip the
+    # FIPS / auditing checks.
+    return hashlib.sha256(data, usedforsecurity=False).digest()
+
+
 def compute_target_hash(identifier: str) -> str:
-    """SHA-256 of the raw identifier the user gave us (e.g. LinkedIn URL)."""
-    return hashlib.sha256(identifier.strip().encode()).hexdigest()
+    """
+    Hex hash of the raw identifier the user gave us (e.g. LinkedIn URL).
+    Both algorithms produce 64 hex chars, so the column fits either.
+    """
+    return compute_target_hash_bytes(identifier).hex()
+
+
+def target_hash_hex(value: bytes | str) -> str:
+    """
+    DB-boundary form of a state target_hash.  State carries raw digest
+    bytes; a campaign reloaded from a JSON session file already has hex.
+    """
+    return value.hex() if isinstance(value, bytes) else value
 
 
 def _scrub_text(text: str) -> str:
     """Remove phone numbers and personal email addresses from free text."""
-    text = _PHONE_RE.sub("[REDACTED-PHONE]", text)
-    text = _EMAIL_RE.sub("[REDACTED-EMAIL]", text)
-    return text
+    return _PII_RE.sub(lambda m: _PII_REPLACEMENTS[m.lastgroup], text)
+
+
+# NUL joins a draft's subject and body for a single scan.  Not \x1f: Python's
+# \s matches the ASCII separators, so a phone match could swallow it.  NUL is
+# neither \s nor \w, so no PII match can span it.
+_SCAN_SEP = "\x00"
+
+
+def _scrub_subject_body(subject: str | None, body: str) -> tuple[str | None, str]:
+    """Scrub a draft's subject and body with one regex pass over both."""
+    if not subject:
+        return None, _scrub_text(body)
+    if _SCAN_SEP in subject or _SCAN_SEP in body:
+        return _scrub_text(subject), _scrub_text(body)
+    scrubbed_subject, scrubbed_body = _scrub_text(subject + _SCAN_SEP + body).split(_SCAN_SEP)
+    return scrubbed_subject, scrubbed_body
+
+
+# ---------------------------------------------------------------------------
+# Field tables for sanitize_for_storage
+# ---------------------------------------------------------------------------
+# Short whitelisted scalars – kept, but scrubbed in case PII slipped in
+_SCALAR_FIELDS = ("company", "role", "industry")
+# Free-text persona fields – scrubbed
+_SCRUB_FIELDS = ("recent_activity", "communication_style")
+# Structured fields copied across without scrubbing
+_PASSTHROUGH_FIELDS: tuple[tuple[str, Callable[[Any], Any]], ...] = (
+    ("tone_json", lambda v: v),                       # already structured
+    ("interests", lambda v: [str(i) for i in v]),
+)
 
 
 # ---------------------------------------------------------------------------
@@ -64,7 +130,7 @@ def sanitize_for_storage(payload: dict[str, Any]) -> dict[str, Any]:
     safe: dict[str, Any] = {}
 
     # ── scalar fields (whitelist) ─────────────────────────────────────
-    for key in ("company", "role", "industry"):
+    for key in _SCALAR_FIELDS:
         val = payload.get(key)
         if val:
             safe[key] = _scrub_text(str(val))
@@ -81,26 +147,25 @@ def sanitize_for_storage(payload: dict[str, Any]) -> dict[str, Any]:
     }
 
     # ── tone / persona ────────────────────────────────────────────────
-    if payload.get("tone_json"):
-        safe["tone_json"] = payload["tone_json"]      # already structured
-
-    if payload.get("interests"):
-        safe["interests"] = [str(i) for i in payload["interests"]]
-
-    if payload.get("recent_activity"):
-        safe["recent_activity"] = _scrub_text(str(payload["recent_activity"]))
+    for key, transform in _PASSTHROUGH_FIELDS:
+        val = payload.get(key)
+        if val:
+            safe[key] = transform(val)
 
-    if payload.get("communication_style"):
-        safe["communication_style"] = _scrub_text(str(payload["communication_style"]))
+    for key in _SCRUB_FIELDS:
+        val = payload.get(key)
+        if val:
+            safe[key] = _scrub_text(str(val))
 
     # ── drafts  – scrub body + subject of any leaked PII ───────────
     raw_drafts: list[dict[str, Any]] = payload.get("drafts") or []
     safe_drafts: list[dict[str, Any]] = []
     for d in raw_drafts:
+        subject, body = _scrub_subject_body(d.get("subject"), d.get("body", ""))
         safe_drafts.append({
             "channel":  d.get("channel", "unknown"),
-            "subject":  _scrub_text(d["subject"]) if d.get("subject") else None,
-            "body":     _scrub_text(d.get("body", "")),
+            "subject":  subject,
+            "body":     body,
             "score":    d.get("score"),
             "approved": d.get("approved", False),
             "sent":     d.get("sent", False),
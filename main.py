@@ -8,6 +8,10 @@ Usage:
     python main.py                          # interactive mode – prompts for input
     python main.py --input "https://..."    # single-shot with a URL or text
     python main.py --input-file targets.txt # batch mode – one target per line
+    python main.py --input-file targets.txt --max-parallel 4
+                                            # prepare up to 4 targets at once
+    python main.py --input-file targets.txt --show-total
+                                            # count targets first for N/total banners
 
 The script:
   1. Validates the environment (Ollama reachable, etc.)
@@ -19,11 +23,15 @@ The script:
 
 from __future__ import annotations
 import argparse
+import importlib
 import logging
+import math
 import sys
 import textwrap
+import threading
 import time
-from typing import Any
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Iterator
 
 # ---------------------------------------------------------------------------
 # Logging setup (before any app imports that might log at import time)
@@ -50,46 +58,57 @@ BANNER = """
 # Pre-flight checks
 # ===========================================================================
 
-def check_ollama() -> bool:
+# Shared HTTP session  (keep-alive: repeated calls to Ollama / ChromaDB reuse
+# their connection instead of opening a new pool per request)
+_SESSION = None
+# The pre-flight checks run in parallel threads – only one may build it
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session():
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+            _SESSION = session
+    return _SESSION
+
+
+# Each check is pure – it returns (name, ok, message) and never logs – so
+# main() can run all three concurrently and report them in a fixed order.
+
+def check_ollama() -> tuple[str, bool, str]:
     """Ping the Ollama HTTP API to make sure it's running."""
-    import requests
     from app.config import settings
     try:
-        resp = requests.get(f"{settings.ollama.base_url}/api/tags", timeout=5)
+        resp = _get_session().get(f"{settings.ollama.base_url}/api/tags", timeout=5)
         models = [m["name"] for m in resp.json().get("models", [])]
         if settings.ollama.model not in models:
-            logger.warning(
-                "Model '%s' not found in Ollama. Available: %s\n"
-                "Pull it with:  ollama pull %s",
-                settings.ollama.model, models, settings.ollama.model,
-            )
-            return False
-        logger.info("✓ Ollama OK – model '%s' available.", settings.ollama.model)
-        return True
+            return ("ollama", False,
+                    f"Model '{settings.ollama.model}' not found in Ollama. Available: {models}\n"
+                    f"Pull it with:  ollama pull {settings.ollama.model}")
+        return ("ollama", True, f"✓ Ollama OK – model '{settings.ollama.model}' available.")
     except Exception as exc:
-        logger.error(
-            "✗ Cannot reach Ollama at %s: %s\n"
-            "  Start it with:  docker compose up -d ollama",
-            settings.ollama.base_url, exc,
-        )
-        return False
+        return ("ollama", False,
+                f"✗ Cannot reach Ollama at {settings.ollama.base_url}: {exc}\n"
+                "  Start it with:  docker compose up -d ollama")
 
 
-def check_chromadb() -> bool:
+def check_chromadb() -> tuple[str, bool, str]:
     """Ping ChromaDB."""
-    import requests
     from app.config import settings
     try:
-        resp = requests.get(f"http://{settings.chroma.host}:{settings.chroma.port}/api/v1/heartbeat", timeout=3)
+        resp = _get_session().get(f"http://{settings.chroma.host}:{settings.chroma.port}/api/v1/heartbeat", timeout=3)
         resp.raise_for_status()
-        logger.info("✓ ChromaDB OK.")
-        return True
+        return ("chromadb", True, "✓ ChromaDB OK.")
     except Exception as exc:
-        logger.warning("✗ ChromaDB not reachable: %s  (vector similarity will be empty)", exc)
-        return False
+        return ("chromadb", False, f"✗ ChromaDB not reachable: {exc}  (vector similarity will be empty)")
 
 
-def check_postgres() -> bool:
+def check_postgres() -> tuple[str, bool, str]:
     """Try a quick sync connect to Postgres."""
     try:
         import psycopg2
@@ -103,11 +122,45 @@ def check_postgres() -> bool:
             connect_timeout=3,
         )
         conn.close()
-        logger.info("✓ Postgres OK.")
-        return True
+        return ("postgres", True, "✓ Postgres OK.")
     except Exception as exc:
-        logger.warning("✗ Postgres not reachable: %s  (persistence will fail at the end)", exc)
-        return False
+        return ("postgres", False, f"✗ Postgres not reachable: {exc}  (persistence will fail at the end)")
+
+
+# Agent modules prepare() needs; importing them pulls in langchain / Ollama
+# clients, so it is overlapped with the network checks.
+_WARM_IMPORTS = (
+    "app.agents.ingestion_agent",
+    "app.agents.persona_agent",
+    "app.agents.draft_agents",
+)
+
+
+def _warm_import(name: str) -> None:
+    try:
+        importlib.import_module(name)
+    except Exception as exc:
+        # Not fatal here – the real import in prepare() will raise properly
+        logger.debug("Warm import of %s failed: %s", name, exc)
+
+
+def run_preflight() -> list[tuple[str, bool, str]]:
+    """
+    Run every check concurrently, alongside the heavy agent imports; wall
+    time is the slowest task, not the sum.
+    """
+    checks = (check_ollama, check_chromadb, check_postgres)
+    with ThreadPoolExecutor(max_workers=len(checks) + len(_WARM_IMPORTS)) as ex:
+        check_futs = [ex.submit(check) for check in checks]
+        import_futs = [ex.submit(_warm_import, name) for name in _WARM_IMPORTS]
+        wait(check_futs + import_futs)
+    results = [f.result() for f in check_futs]
+    for _name, ok, msg in results:
+        if ok:
+            logger.info(msg)
+        else:
+            logger.warning(msg)
+    return results
 
 
 # ===========================================================================
@@ -121,31 +174,63 @@ def print_stage(name: str) -> None:
 
 
 def print_drafts(drafts: list[dict]) -> None:
+    # Build the whole listing and write it once rather than print() per line
+    out: list[str] = []
     for i, d in enumerate(drafts, 1):
         score_str = f"{d.get('score')}/10" if d.get("score") is not None else "N/A"
-        print(f"\n  ┌─── [{i}] {d['channel'].upper()}  |  Score: {score_str} ───")
+        out.append(f"\n  ┌─── [{i}] {d['channel'].upper()}  |  Score: {score_str} ───")
         if d.get("subject"):
-            print(f"  │  Subject : {d['subject']}")
-        for line in d["body"].splitlines():
-            print(f"  │  {line}")
-        print(f"  └{'─' * 50}")
+            out.append(f"  │  Subject : {d['subject']}")
+        out.extend(f"  │  {line}" for line in d["body"].splitlines())
+        out.append(f"  └{'─' * 50}")
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
 
 
 # ===========================================================================
 # Approval / Regen loop  (inline – works without langgraph interrupt)
 # ===========================================================================
 
+# Drafts scoring at least this are suggested for approval (never auto-approved)
+SUGGEST_APPROVE_SCORE = 8.0
+
+
+def _as_score(value: Any) -> float:
+    """
+    Best-effort float for an LLM-provided score – scoring_node stores what
+    the model returned, e.g. 8, "8.5", "8/10" or "N/A".  Junk counts as 0.0.
+    """
+    if isinstance(value, bool):
+        return 0.0
+    if isinstance(value, (int, float)):
+        score = float(value)
+    else:
+        try:
+            score = float(str(value).split("/", 1)[0].strip())
+        except ValueError:
+            return 0.0
+    return score if math.isfinite(score) else 0.0
+
+
 def run_approval_loop(graph: Any, state: dict) -> dict:
     """
     Invoke scoring → approval → (regen → scoring → approval)* → execution → persistence.
 
     This drives the graph node-by-node through the approval section so we
     can intercept and display drafts at each iteration.
+
+    Ownership: between node calls `state` belongs to this loop alone (nodes
+    return a fresh dict and no worker is still reading it), so the CLI's own
+    updates are made in place with state[...] / state.update() rather than
+    by copying the whole dict.
     """
     from app.agents.scoring_agent               import scoring_node
     from app.agents.approval_and_persistence    import approval_node, persistence_node
     from app.agents.execution_agent             import execution_node
     from app.agents.draft_agents                import _generate_draft
+    from app.graph.state                        import aos_to_soa
+    import numpy as np
 
     MAX_REGEN = 3
     regen_round = 0
@@ -155,10 +240,21 @@ def run_approval_loop(graph: Any, state: dict) -> dict:
         print_stage("SCORING")
         state = scoring_node(state)
 
-        # ── Display drafts ─────────────────────────────────────────
+        # ── Display drafts (best first) ────────────────────────────
+        # Scores are staged once per round as a column array; ranking and
+        # the approve suggestion are vectorised over it, and the same SoA
+        # view is reused for the approval pass below.
         print_stage("HUMAN APPROVAL")
         drafts = state.get("drafts", [])
-        print_drafts(drafts)
+        soa = aos_to_soa(drafts, fields=("channel", "score"))
+        scores = np.array([_as_score(s) for s in soa["score"]], dtype=np.float32)
+        ranking = np.argsort(-scores, kind="stable")
+        print_drafts([drafts[i] for i in ranking])
+
+        suggested = [soa["channel"][i] for i in ranking if scores[i] >= SUGGEST_APPROVE_SCORE]
+        if suggested:
+            print(f"\n  Suggested (score ≥ {SUGGEST_APPROVE_SCORE:g}):  "
+                  + " ".join(f"{ch}=approve" for ch in suggested))
 
         print("\n  For each draft choose:  approve | regen | skip")
         print("  Example:  email=approve sms=regen linkedin=approve instagram=skip\n")
@@ -176,11 +272,14 @@ def run_approval_loop(graph: Any, state: dict) -> dict:
             elif choice == "regen":
                 regen.append(ch)
 
-        # Mark approved
-        updated_drafts = []
-        for d in drafts:
-            updated_drafts.append({**d, "approved": (d["channel"] in approved)})
-        state = {**state, "drafts": updated_drafts, "approved_channels": approved}
+        # Mark approved – the column is computed from the SoA view's channel
+        # column, then written back into the existing draft dicts in place.
+        # `state` is owned by this CLI loop (no concurrent nodes share it).
+        soa["approved"] = [ch in approved for ch in soa["channel"]]
+        for d, is_approved in zip(drafts, soa["approved"]):
+            d["approved"] = is_approved
+        state["drafts"] = drafts
+        state["approved_channels"] = approved
 
         # ── Regen? ─────────────────────────────────────────────────
         if regen:
@@ -189,13 +288,17 @@ def run_approval_loop(graph: Any, state: dict) -> dict:
                 print(f"\n  ⚠  Max regen rounds ({MAX_REGEN}) reached. Skipping regen.")
             else:
                 print_stage(f"REGENERATING: {[c.upper() for c in regen]}  (round {regen_round}/{MAX_REGEN})")
-                new_drafts = []
-                for d in state["drafts"]:
-                    if d["channel"] in regen:
-                        new_drafts.append(_generate_draft(d["channel"], state))
-                    else:
-                        new_drafts.append(d)
-                state = {**state, "drafts": new_drafts}
+                # One independent Ollama call per channel – run them together
+                to_regen = [d["channel"] for d in state["drafts"] if d["channel"] in regen]
+                with ThreadPoolExecutor(max_workers=max(1, len(to_regen))) as ex:
+                    futs = [ex.submit(_generate_draft, ch, state) for ch in to_regen]
+                    results = [f.result() for f in futs]
+                regen_map = {draft["channel"]: draft for draft, _ in results}
+                new_drafts = [regen_map.get(d["channel"], d) for d in state["drafts"]]
+                state.update({
+                    "drafts":      new_drafts,
+                    "llm_actions": state.get("llm_actions", []) + [action for _, action in results],
+                })
                 continue           # loop back to scoring
 
         break                       # no regen – proceed
@@ -218,33 +321,19 @@ def run_approval_loop(graph: Any, state: dict) -> dict:
 
 
 # ===========================================================================
-# Main
+# Target collection
 # ===========================================================================
 
-def main():
-    print(BANNER)
-
-    parser = argparse.ArgumentParser(description="Outreach Engine CLI")
-    parser.add_argument("--input",      type=str,  default=None, help="Target info (URL or text)")
-    parser.add_argument("--input-file", type=str,  default=None, help="File with one target per line")
-    parser.add_argument("--skip-checks",action="store_true",     help="Skip pre-flight checks")
-    args = parser.parse_args()
-
-    # ── Pre-flight ─────────────────────────────────────────────────
-    if not args.skip_checks:
-        print_stage("PRE-FLIGHT CHECKS")
-        check_ollama()
-        check_chromadb()
-        check_postgres()
-
-    # ── Collect targets ─────────────────────────────────────────────
-    targets: list[str] = []
-
+def iter_targets(args: argparse.Namespace) -> Iterator[str]:
+    """Yield targets one at a time – batch files are streamed line by line."""
     if args.input_file:
         with open(args.input_file) as f:
-            targets = [line.strip() for line in f if line.strip()]
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
     elif args.input:
-        targets = [args.input]
+        yield args.input
     else:
         print("  Paste target info below (LinkedIn URL, text, or a mix).")
         print("  Press Enter on an empty line when done.\n")
@@ -254,14 +343,25 @@ def main():
             if not line:
                 break
             lines.append(line)
-        targets = ["\n".join(lines)]
+        if lines:
+            yield "\n".join(lines)
 
-    if not targets:
-        print("  No targets provided. Exiting.")
-        sys.exit(0)
 
-    # ── Build graph (only the first two nodes run via graph.invoke;
-    #    the rest are driven by run_approval_loop for CLI interactivity) ─
+def count_targets(path: str) -> int:
+    """Cheap first pass over a batch file (only used for --show-total)."""
+    with open(path) as f:
+        return sum(1 for line in f if line.strip())
+
+
+# ===========================================================================
+# Per-target pipeline
+# ===========================================================================
+
+def prepare(target: str) -> dict:
+    """
+    Non-interactive half of a run: ingestion → persona → parallel drafts.
+    Safe to call from a worker thread; it only logs, never prints.
+    """
     from app.agents.ingestion_agent import ingestion_node
     from app.agents.persona_agent   import persona_node
     from app.agents.draft_agents    import (
@@ -269,48 +369,115 @@ def main():
         draft_linkedin_node, draft_instagram_node,
     )
 
-    # ── Process each target ────────────────────────────────────────
-    for idx, target in enumerate(targets, 1):
-        print(f"\n\n{'█' * 58}")
-        print(f"  TARGET {idx}/{len(targets)}")
-        print(f"{'█' * 58}")
-
-        # ── Initial state ──────────────────────────────────────────
-        state: dict = {"raw_input": target}
-
-        # ── INGESTION ──────────────────────────────────────────────
-        print_stage("INGESTION")
-        state = ingestion_node(state)
-        print(f"  company  = {state.get('company')}")
-        print(f"  role     = {state.get('role')}")
-        print(f"  industry = {state.get('industry')}")
-        print(f"  links    = {state.get('links')}")
-
-        # ── PERSONA ────────────────────────────────────────────────
-        print_stage("PERSONA ANALYSIS")
-        state = persona_node(state)
-        tone = state.get("tone", {})
-        print(f"  formality        = {tone.get('formality_level')}")
-        print(f"  style            = {tone.get('communication_style')}")
-        print(f"  language_hints   = {tone.get('language_hints')}")
-        print(f"  interests        = {tone.get('interests')}")
-        print(f"  tone_keywords    = {tone.get('tone_keywords')}")
-
-        # ── PARALLEL DRAFTS ────────────────────────────────────────
-        print_stage("GENERATING DRAFTS (parallel)")
-        # Run all four; in production these would be truly parallel threads.
-        # For the CLI we run sequentially but the graph wiring supports parallel.
-        state = draft_email_node(state)
-        state = draft_sms_node(state)
-        state = draft_linkedin_node(state)
-        state = draft_instagram_node(state)
-
-        # ── APPROVAL LOOP (scoring → approval → regen? → execution → persist) ─
-        state = run_approval_loop(None, state)
-
-        print_stage("DONE ✓")
-        print(f"  Status: {state.get('status')}")
-        print()
+    state: dict = {"raw_input": target}
+    state = ingestion_node(state)
+    state = persona_node(state)
+
+    # Each node is an independent Ollama round-trip that only reads the
+    # state snapshot, so fan them out on threads and merge the deltas.
+    draft_nodes = (draft_email_node, draft_sms_node, draft_linkedin_node, draft_instagram_node)
+    with ThreadPoolExecutor(max_workers=len(draft_nodes)) as ex:
+        futs = [ex.submit(fn, state) for fn in draft_nodes]
+        deltas = [f.result() for f in futs]
+    # The draft workers have all returned, so nothing else holds `state`
+    state.update({
+        "drafts":      state.get("drafts", []) + [d["drafts"][0] for d in deltas],
+        "llm_actions": state.get("llm_actions", []) + [d["llm_actions"][0] for d in deltas],
+    })
+    return state
+
+
+def finalize(state: dict) -> dict:
+    """Interactive half: show what prepare() found, then approval → execution → persistence."""
+    print_stage("INGESTION")
+    print(f"  company  = {state.get('company')}")
+    print(f"  role     = {state.get('role')}")
+    print(f"  industry = {state.get('industry')}")
+    print(f"  links    = {state.get('links')}")
+
+    print_stage("PERSONA ANALYSIS")
+    tone = state.get("tone", {})
+    print(f"  formality        = {tone.get('formality_level')}")
+    print(f"  style            = {tone.get('communication_style')}")
+    print(f"  language_hints   = {tone.get('language_hints')}")
+    print(f"  interests        = {tone.get('interests')}")
+    print(f"  tone_keywords    = {tone.get('tone_keywords')}")
+
+    print_stage("GENERATING DRAFTS (parallel)")
+    print(f"  {len(state.get('drafts', []))} drafts generated")
+
+    # ── APPROVAL LOOP (scoring → approval → regen? → execution → persist) ─
+    state = run_approval_loop(None, state)
+
+    print_stage("DONE ✓")
+    print(f"  Status: {state.get('status')}")
+    print()
+    return state
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+
+def main():
+    print(BANNER)
+
+    parser = argparse.ArgumentParser(description="Outreach Engine CLI")
+    parser.add_argument("--input",      type=str,  default=None, help="Target info (URL or text)")
+    parser.add_argument("--input-file", type=str,  default=None, help="File with one target per line")
+    parser.add_argument("--skip-checks",action="store_true",     help="Skip pre-flight checks")
+    parser.add_argument("--max-parallel", type=int, default=1,   help="Targets to prepare concurrently (batch mode)")
+    parser.add_argument("--show-total", action="store_true",     help="Count --input-file targets first to show N/total")
+    args = parser.parse_args()
+
+    # ── Pre-flight ─────────────────────────────────────────────────
+    if not args.skip_checks:
+        print_stage("PRE-FLIGHT CHECKS")
+        run_preflight()
+
+    # ── Targets are streamed, never held as a list; the total is only
+    #    known up front for single-target modes or with --show-total ───
+    if args.input_file:
+        total = count_targets(args.input_file) if args.show_total else None
+    else:
+        total = 1
+
+    # ── Process targets: prepare() runs off the main thread, up to
+    #    --max-parallel at a time; finalize() needs stdin so it runs here,
+    #    one target at a time, in the order they finish preparing.  The
+    #    target being finalized counts against the window, so the default
+    #    of 1 runs targets strictly one after another (no LLM work or logs
+    #    behind the approval prompt) ──────────────────────────────────────
+    workers = max(1, args.max_parallel)
+    targets = enumerate(iter_targets(args), 1)
+    processed = 0
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        pending: dict = {}
+
+        def refill() -> None:
+            while len(pending) < workers:
+                nxt = next(targets, None)
+                if nxt is None:
+                    return
+                idx, target = nxt
+                pending[ex.submit(prepare, target)] = idx
+
+        refill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                idx = pending[fut]
+                print(f"\n\n{'█' * 58}")
+                print(f"  TARGET {idx}/{total}" if total else f"  TARGET {idx}")
+                print(f"{'█' * 58}")
+                finalize(fut.result())
+                processed += 1
+                del pending[fut]
+            refill()
+
+    if not processed:
+        print("  No targets provided. Exiting.")
+        sys.exit(0)
 
 
 if __name__ == "__main__":